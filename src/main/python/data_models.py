@@ -1,17 +1,28 @@
 """Models for connecting opened data with views."""
 
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import List, Tuple, Union
 
 from PyQt6 import QtCore, QtGui
 import numpy as np
-from rimseval.guis.integrals import tableau_color
+
+import utils
+
+# roles that the models actually answer, all others return early
+_OPEN_FILES_ROLES = frozenset(
+    (QtCore.Qt.ItemDataRole.DisplayRole, QtCore.Qt.ItemDataRole.DecorationRole)
+)
+_INTEGRALS_HEADER_ROLES = frozenset(
+    (QtCore.Qt.ItemDataRole.DisplayRole, QtCore.Qt.ItemDataRole.ForegroundRole)
+)
 
 
 class OpenFilesModel(QtCore.QAbstractListModel):
     """Model for the data that are in the open files view.
 
-    The ``open_files`` variable is a list of filenames, as strings.
+    The ``open_files`` variable is a list of filenames, as strings. The active file
+    is only tracked by its index, such that changing it does not touch the list.
     """
 
     def __init__(self, *args, tick=None, **kwargs):
@@ -20,7 +31,8 @@ class OpenFilesModel(QtCore.QAbstractListModel):
         :param tick: File Path to the tick icon.
         """
         super().__init__(*args, **kwargs)
-        self.tick = QtGui.QImage(tick)
+        self._tick_path = tick
+        self._tick = None
 
         self.open_files = []
         self._currently_active = 0
@@ -30,15 +42,22 @@ class OpenFilesModel(QtCore.QAbstractListModel):
         """Return index of currently active file."""
         return self._currently_active
 
+    @property
+    def tick(self) -> QtGui.QPixmap:
+        """Return the tick icon, loaded on first use."""
+        if self._tick is None:
+            self._tick = QtGui.QPixmap(self._tick_path)
+        return self._tick
+
     def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
-        if role == QtCore.Qt.ItemDataRole.DisplayRole:
-            _, text = self.open_files[index.row()]
-            return text
+        if role not in _OPEN_FILES_ROLES:
+            return None
 
-        if role == QtCore.Qt.ItemDataRole.DecorationRole:
-            status, _ = self.open_files[index.row()]
-            if status:
-                return self.tick
+        row = index.row()
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return self.open_files[row]
+        if row == self._currently_active:
+            return self.tick
 
     def rowCount(self, index) -> int:
         """Return the row count."""
@@ -46,19 +65,25 @@ class OpenFilesModel(QtCore.QAbstractListModel):
 
     def update_current(self, ind: int) -> None:
         """Update the currently active item to the new one."""
-        self.open_files[self._currently_active][0] = False
+        old_ind = self._currently_active
         self._currently_active = ind
-        self.open_files[ind][0] = True
-        self.layoutChanged.emit()
+
+        decoration = [QtCore.Qt.ItemDataRole.DecorationRole]
+        self.dataChanged.emit(self.index(old_ind), self.index(old_ind), decoration)
+        self.dataChanged.emit(self.index(ind), self.index(ind), decoration)
 
     def add_to_list(self, names: List[Path]) -> None:
         """Add new items to the list at the end.
 
         :param names: List of new file names to append.
         """
-        for name in names:
-            self.open_files.append([False, name.with_suffix("").name])
-        self.layoutChanged.emit()
+        if not names:
+            return
+
+        first = len(self.open_files)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(names) - 1)
+        self.open_files.extend(name.stem for name in names)
+        self.endInsertRows()
 
     def remove_from_list(self, ids: List[int], main_id: int) -> None:
         """Remove selected ids from the list.
@@ -66,81 +91,89 @@ class OpenFilesModel(QtCore.QAbstractListModel):
         :param ids: IDs to remove.
         :param main_id: ID of the currently active one (new ID).
         """
-        self.open_files[self._currently_active][0] = False  # unset active one
+        for start, stop in reversed(contiguous_runs(sorted(set(ids)))):
+            self.beginRemoveRows(QtCore.QModelIndex(), start, stop - 1)
+            del self.open_files[start:stop]
+            self.endRemoveRows()
 
-        ids.sort(reverse=True)
-        for id in ids:
-            del self.open_files[id]
-
-        self.open_files[main_id][0] = True  # set new active
         self._currently_active = main_id
 
-        self.layoutChanged.emit()
+        self.dataChanged.emit(
+            self.index(main_id),
+            self.index(main_id),
+            [QtCore.Qt.ItemDataRole.DecorationRole],
+        )
 
     def set_new_list(self, names: List[Path]) -> None:
         """Clear the old model and set the new dataset."""
-        self.open_files = []
+        self.beginResetModel()
+        self.open_files = [name.stem for name in names]
         self._currently_active = 0
-        for it, name in enumerate(names):
-            status = True if it == self._currently_active else False
-            self.open_files.append([status, name.with_suffix("").name])
-        self.layoutChanged.emit()
+        self.endResetModel()
 
 
 class IntegralsModel(QtCore.QAbstractTableModel):
     """Data model for integrals."""
 
+    _header = ("Peak", "Counts", "\u00B11\u03C3", "Delta", "\u00B11\u03C3")
+    _row_header = "\u25CF"
+
     def __init__(self, data=None, names=None, deltas=None):
         """Initialize the integral model.
 
         :param data: Integrals, from ``CRDProcessor.integrals``.
+        :param names: Names of the peaks.
+        :param deltas: Delta values, zeros if None.
         """
         super().__init__()
         self._names = names
-        self._header = ["Peak", "Counts", "\u00B11\u03C3", "Delta", "\u00B11\u03C3"]
 
         if data is None:
-            self._data = np.zeros((0, 0, 0, 0))
+            self._data = np.empty((0, 4))
         else:
             if deltas is None:
-                deltas = np.zeros_lie(self._data)
-            self._data = np.stack([data, deltas], axis=1)
-            self._data.reshape(self._data.shape[0], 4)
+                deltas = np.zeros_like(data)
+            self._data = self._assemble(data, deltas)
+
+        self._update_formatted()
 
     def columnCount(self, index):
         """Return the number of columns."""
-        if self._data.shape[1] == 0:
+        if self._names is None:  # no data set
             return 0
         else:
             return self._data.shape[1] + 1  # add names
 
     def data(self, index, role):
         """Return the data."""
+        if role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
+
         row = index.row()
         col = index.column()
 
-        if role == QtCore.Qt.ItemDataRole.DisplayRole:
-            if col == 0:
-                try:
-                    return str(self._names[row])
-                except IndexError:
-                    return "N/A"
-            else:
-                value = np.round(self._data[row][col - 1], 2)
-                return str(value)
+        if col == 0:
+            try:
+                return self._names_str[row]
+            except IndexError:
+                return "N/A"
+        else:
+            return self._formatted[row][col - 1]
 
     def headerData(self, section, orientation, role):
         # section is the index of the column/row.
+        if role not in _INTEGRALS_HEADER_ROLES:
+            return None
+
         if role == QtCore.Qt.ItemDataRole.DisplayRole:
             if orientation == QtCore.Qt.Orientation.Horizontal:  # column headers
-                return str(self._header[section])
+                return self._header[section]
             if orientation == QtCore.Qt.Orientation.Vertical:  # row headers
-                return "\u25CF"
+                return self._row_header
 
         if role == QtCore.Qt.ItemDataRole.ForegroundRole:
             if orientation == QtCore.Qt.Orientation.Vertical:
-                color = tableau_color(section)
-                return QtGui.QBrush(QtGui.QColor(color))
+                return row_brush(section)
 
     def rowCount(self, index):
         """Return the number of rows."""
@@ -148,9 +181,11 @@ class IntegralsModel(QtCore.QAbstractTableModel):
 
     def clear_data(self):
         """Clear data."""
+        self.beginResetModel()
         self._names = None
-        self._data = np.empty((0, 0, 0, 0))
-        self.layoutChanged.emit()
+        self._data = np.empty((0, 4))
+        self._update_formatted()
+        self.endResetModel()
 
     def update_data(self, data: np.ndarray, names: List[str], deltas: np.ndarray):
         """Update the model with new data.
@@ -159,15 +194,34 @@ class IntegralsModel(QtCore.QAbstractTableModel):
         :param names: Names of the peaks
         :param deltas: Delta value to set.
         """
+        self.beginResetModel()
         self._names = names
-        data = np.stack([data, deltas], axis=1)
-        self._data = data.reshape(data.shape[0], 4)
-        self.layoutChanged.emit()
+        self._data = self._assemble(data, deltas)
+        self._update_formatted()
+        self.endResetModel()
+
+    @staticmethod
+    def _assemble(data: np.ndarray, deltas: np.ndarray) -> np.ndarray:
+        """Combine integrals and deltas into one row per peak.
+
+        :param data: Integrals and their uncertainties, shape (n, 2).
+        :param deltas: Delta values and their uncertainties, shape (n, 2).
+
+        :return: Array of shape (n, 4).
+        """
+        return np.concatenate([data, deltas], axis=1)
+
+    def _update_formatted(self) -> None:
+        """Pre-format the display strings, such that ``data()`` only has to index."""
+        self._names_str = [] if self._names is None else [str(n) for n in self._names]
+        self._formatted = np.round(self._data, 2).astype(str).tolist()
 
 
 class IntegralBackgroundDefinitionModel(QtCore.QAbstractTableModel):
     """Abstract table model for the integral and backgruond definitions."""
 
+    _header = ("Peak", "Lower Lim.", "Upper Lim.")
+
     def __init__(self, data=None):
         """Initialize integrals definition model.
 
@@ -180,25 +234,27 @@ class IntegralBackgroundDefinitionModel(QtCore.QAbstractTableModel):
         else:
             self._names = data[0]
             self._values = data[1]
-
-        self._header = ["Peak", "Lower Lim.", "Upper Lim."]
+            self._update_formatted()
 
     def columnCount(self, index):
-        return self._values.shape[1] + 1
+        return self._values_buf.shape[1] + 1
 
     def data(self, index, role):
-        if role == QtCore.Qt.ItemDataRole.DisplayRole:
-            if index.column() == 0:
-                value = self._names[index.row()]
-            else:
-                value = np.round(self._values[index.row()][index.column() - 1], 5)
-            return str(value)
+        if role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
+
+        if index.column() == 0:
+            return str(self._names[index.row()])
+        return self._formatted[index.row()][index.column() - 1]
 
     def delete_selected(self, rows: List):
-        """Remove names for selected entries and then call the remove empties method."""
-        for ind in rows:
-            self._names[ind] = ""
-        self.remove_empties()
+        """Remove selected entries and all empty ones in a single pass."""
+        rows = set(rows)
+        keep_mask = np.array(
+            [it not in rows and name != "" for it, name in enumerate(self._names)],
+            dtype=bool,
+        )
+        self._compact(keep_mask)
         if len(self._names) == 0:
             self.init_empty()
 
@@ -212,12 +268,14 @@ class IntegralBackgroundDefinitionModel(QtCore.QAbstractTableModel):
 
     def headerData(self, section, orientation, role):
         # section is the index of the column/row.
-        if role == QtCore.Qt.ItemDataRole.DisplayRole:
-            if orientation == QtCore.Qt.Orientation.Horizontal:
-                return str(self._header[section])
+        if role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
+
+        if orientation == QtCore.Qt.Orientation.Horizontal:
+            return self._header[section]
 
     def rowCount(self, index):
-        return self._values.shape[0]
+        return self._size
 
     def setData(self, index, value, role):
         """Make the data editable."""
@@ -227,21 +285,27 @@ class IntegralBackgroundDefinitionModel(QtCore.QAbstractTableModel):
             return False
 
         row = index.row()
-        if row < 0 or row >= self._values.shape[0]:
+        if row < 0 or row >= self._size:
             return False
 
         column = index.column()
-        if column < 0 or column >= self._values.shape[1] + 1:
+        if column < 0 or column >= self._values_buf.shape[1] + 1:
             return False
 
         if column == 0:
             self._names[row] = value
-            self.dataChanged.emit(index, index)
         else:
             try:
-                self._values[row][column - 1] = value
-            except ValueError:
+                value = float(value)
+            except (TypeError, ValueError):
                 return False
+            self._values_buf[row, column - 1] = value
+            self._formatted[row][column - 1] = str(np.round(value, 5))
+        self.dataChanged.emit(
+            index,
+            index,
+            [QtCore.Qt.ItemDataRole.DisplayRole, QtCore.Qt.ItemDataRole.EditRole],
+        )
         return True
 
     # PROPERTIES #
@@ -250,23 +314,55 @@ class IntegralBackgroundDefinitionModel(QtCore.QAbstractTableModel):
         """Return all names in columns"""
         return self._names
 
+    @property
+    def _values(self) -> np.ndarray:
+        """Return a view of the used part of the values buffer."""
+        return self._values_buf[: self._size]
+
+    @_values.setter
+    def _values(self, value: np.ndarray) -> None:
+        """Copy the given values into a new buffer."""
+        self._values_buf = np.array(value, dtype=np.float64).reshape(-1, 2)
+        self._size = self._values_buf.shape[0]
+
     def add_row(self):
         """Add a row to the integral data."""
+        self.beginInsertRows(QtCore.QModelIndex(), self._size, self._size)
+        self._reserve(1)
+        self._values_buf[self._size] = 0.0
+        self._size += 1
         self._names.append("")
-        self._values = np.append(self._values, np.zeros((1, 2)), axis=0)
-        self.layoutChanged.emit()
+        self._update_formatted()
+        self.endInsertRows()
 
     def add_element(self, names, values):
         """Add isotopes with given values, overwrite doubles."""
+        name_to_row = {name: it for it, name in enumerate(self._names)}
+        new_names = []
+        new_values = []
         for it, name in enumerate(names):
-            if name not in self._names:
-                self._names.append(name)
-                self._values = np.append(self._values, values[it].reshape(1, 2), axis=0)
+            index = name_to_row.get(name)
+            if index is None:
+                new_names.append(name)
+                new_values.append(values[it])
             else:
-                index = self._names.index(name)
                 self._values[index] = values[it]
+                self._formatted[index] = np.round(values[it], 5).astype(str).tolist()
+                self.dataChanged.emit(self.index(index, 1), self.index(index, 2))
+
+        if new_names:
+            first = self._size
+            self.beginInsertRows(
+                QtCore.QModelIndex(), first, first + len(new_names) - 1
+            )
+            self._reserve(len(new_names))
+            self._values_buf[first : first + len(new_names)] = new_values
+            self._size += len(new_names)
+            self._names += new_names
+            self._update_formatted()
+            self.endInsertRows()
+
         self.remove_empties()
-        self.layoutChanged.emit()
 
     def auto_fill(self, masses: List[float], lower: float, upper: float):
         """Automatically fill the values of all the peaks.
@@ -277,37 +373,124 @@ class IntegralBackgroundDefinitionModel(QtCore.QAbstractTableModel):
         """
 
         # we have the masses, fill them
-        for it, mass in enumerate(masses):
-            self._values[it][0] = mass - lower
-            self._values[it][1] = mass + upper
-        self.layoutChanged.emit()
+        masses = np.asarray(masses, dtype=np.float64)
+        num = masses.shape[0]
+        self._values_buf[:num, 0] = masses - lower
+        self._values_buf[:num, 1] = masses + upper
+        self._update_formatted()
+        if num > 0:
+            self.dataChanged.emit(self.index(0, 1), self.index(num - 1, 2))
 
     def init_empty(self):
         """Initialize empty data."""
         num_of_lines = 10
+        self.beginResetModel()
         self._names = ["" for it in range(num_of_lines)]
         self._values = np.zeros((num_of_lines, 2))
-        self.layoutChanged.emit()
+        self._update_formatted()
+        self.endResetModel()
 
     def remove_empties(self):
         """Delete empties from list."""
-        # remove empties
-        while "" in self._names:
-            ind = self._names.index("")
-            self._names.pop(ind)
-            self._values = np.delete(self._values, ind, axis=0)
-        self.layoutChanged.emit()
+        keep_mask = np.array([name != "" for name in self._names], dtype=bool)
+        self._compact(keep_mask)
 
     def return_data(self):
         """Return data of the model."""
         self.remove_empties()
         if self._names:
-            return self._names, self._values
+            return self._names, self._values.copy()
+
+    def _compact(self, keep_mask: np.ndarray) -> None:
+        """Keep only the rows where the mask is ``True``.
+
+        Removed rows are grouped into contiguous runs, such that views are notified
+        once per run and not once per row.
+
+        :param keep_mask: Boolean mask with one entry per row.
+        """
+        removed = np.flatnonzero(~keep_mask)
+        for start, stop in reversed(contiguous_runs(removed)):
+            num = stop - start
+            self.beginRemoveRows(QtCore.QModelIndex(), start, stop - 1)
+            self._values_buf[start : self._size - num] = self._values_buf[
+                stop : self._size
+            ]
+            self._size -= num
+            del self._names[start:stop]
+            del self._formatted[start:stop]
+            self.endRemoveRows()
+
+    def _reserve(self, num: int) -> None:
+        """Ensure the values buffer can hold ``num`` more rows.
+
+        The capacity is at least doubled when the buffer grows, such that adding
+        rows one by one only copies the data a logarithmic number of times.
+
+        :param num: Number of rows that will be added.
+        """
+        required = self._size + num
+        capacity = self._values_buf.shape[0]
+        if required > capacity:
+            new_buf = np.empty((max(required, 2 * capacity), 2))
+            new_buf[: self._size] = self._values
+            self._values_buf = new_buf
+
+    def _update_formatted(self) -> None:
+        """Pre-format the display strings of the values for ``data()``."""
+        self._formatted = np.round(self._values, 5).astype(str).tolist()
+
+
+class MassCalModel(QtCore.QAbstractTableModel):
+    """Read-only data model for the mass calibration of a CRD file."""
+
+    _header = ("ToF (us)", "Mass (amu)")
+
+    def __init__(self, mcal: np.ndarray):
+        """Initialize the mass calibration model.
+
+        :param mcal: Mass calibration, directly from crd file. Time of flight in the
+            first, mass in the second column.
+        """
+        super().__init__()
+        self._data = np.ascontiguousarray(mcal)
+
+        # format once, such that painting is only a lookup
+        self._tof = [f"{tm:.3f}" for tm in self._data[:, 0].tolist()]
+        self._mass = [f"{ms:.3f}" for ms in self._data[:, 1].tolist()]
+
+    def columnCount(self, index):
+        """Return the number of columns."""
+        return 2
+
+    def data(self, index, role):
+        """Return the data."""
+        if role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
+
+        if index.column() == 0:
+            return self._tof[index.row()]
+        else:
+            return self._mass[index.row()]
+
+    def headerData(self, section, orientation, role):
+        # section is the index of the column/row.
+        if role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
+
+        if orientation == QtCore.Qt.Orientation.Horizontal:
+            return self._header[section]
+
+    def rowCount(self, index):
+        """Return the number of rows."""
+        return self._data.shape[0]
 
 
 class NormIsosModel(QtCore.QAbstractTableModel):
     """Data model for normalization isotopes dictionary."""
 
+    _header = ("Element", "Isotope")
+
     def __init__(self, data=None):
         """Initialize the normalization isotopes model.
 
@@ -315,13 +498,12 @@ class NormIsosModel(QtCore.QAbstractTableModel):
             {"Ba": "Ba-136"}, or None
         """
         super().__init__()
-        self._header = ["Element", "Isotope"]
 
         if data is None:
             self.init_empty()
         else:
             self._data = data
-            self._keys = list(self._data.keys())
+            self._update_rows()
 
     def add_entry(self, ele: str, iso: str) -> None:
         """Add a new element / isotope combination and change the layout.
@@ -329,9 +511,18 @@ class NormIsosModel(QtCore.QAbstractTableModel):
         :param ele: Element name.
         :param iso: Isotope name.
         """
-        self._data[ele] = iso
-        self._keys = list(self._data.keys())
-        self.layoutChanged.emit()
+        if ele in self._key_to_row:
+            self._data[ele] = iso
+            row = self._key_to_row[ele]
+            self._rows[row] = (ele, iso)
+            self.dataChanged.emit(self.index(row, 1), self.index(row, 1))
+        else:
+            row = len(self._rows)
+            self.beginInsertRows(QtCore.QModelIndex(), row, row)
+            self._data[ele] = iso
+            self._rows.append((ele, iso))
+            self._key_to_row[ele] = row
+            self.endInsertRows()
 
     def columnCount(self, index):
         """Return the number of columns."""
@@ -339,34 +530,34 @@ class NormIsosModel(QtCore.QAbstractTableModel):
 
     def data(self, index, role):
         """Return the data."""
-        row = index.row()
-        col = index.column()
-        key = self._keys[row]
+        if role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
 
-        if role == QtCore.Qt.ItemDataRole.DisplayRole:
-            if col == 0:
-                return key
-            else:
-                return self._data[key]
+        return self._rows[index.row()][index.column()]
 
     def delete_selected(self, rows: List):
         """Delete all entries that are selected."""
-        for ind in rows:
-            del self._data[self._keys[ind]]
-        self._keys = list(self._data.keys())
-        self.layoutChanged.emit()
+        for ind in sorted(rows, reverse=True):
+            self.beginRemoveRows(QtCore.QModelIndex(), ind, ind)
+            del self._data[self._rows[ind][0]]
+            del self._rows[ind]
+            self.endRemoveRows()
+        self._key_to_row = {key: it for it, (key, _) in enumerate(self._rows)}
 
     def headerData(self, section, orientation, role):
         # section is the index of the column/row.
-        if role == QtCore.Qt.ItemDataRole.DisplayRole:
-            if orientation == QtCore.Qt.Orientation.Horizontal:
-                return str(self._header[section])
+        if role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
+
+        if orientation == QtCore.Qt.Orientation.Horizontal:
+            return self._header[section]
 
     def init_empty(self):
         """Initialize empty model."""
+        self.beginResetModel()
         self._data = {}
-        self._keys = []
-        self.layoutChanged.emit()
+        self._update_rows()
+        self.endResetModel()
 
     def return_data(self) -> dict:
         """Return the dictionary with all data."""
@@ -374,4 +565,43 @@ class NormIsosModel(QtCore.QAbstractTableModel):
 
     def rowCount(self, index):
         """Return the number of rows."""
-        return len(self._keys)
+        return len(self._rows)
+
+    def _update_rows(self) -> None:
+        """Rebuild the ``(element, isotope)`` rows and the key to row lookup."""
+        self._rows = list(self._data.items())
+        self._key_to_row = {key: it for it, key in enumerate(self._data)}
+
+
+# METHODS #
+
+
+@utils.release_on_quit
+@lru_cache(maxsize=64)
+def row_brush(section: int) -> QtGui.QBrush:
+    """Return the brush for a colored row header, cached between all models.
+
+    :param section: Row number.
+
+    :return: Brush with the tableau color of the given row.
+    """
+    from rimseval.guis.integrals import tableau_color
+
+    return QtGui.QBrush(QtGui.QColor(tableau_color(section)))
+
+
+def contiguous_runs(indexes: Union[List[int], np.ndarray]) -> List[Tuple[int, int]]:
+    """Group sorted indexes into runs of consecutive values.
+
+    :param indexes: Sorted, unique indexes, as list or array.
+
+    :return: List of ``(start, stop)`` tuples, ``stop`` is exclusive.
+    """
+    runs = []
+    for ind in indexes:
+        ind = int(ind)
+        if runs and runs[-1][1] == ind:
+            runs[-1] = (runs[-1][0], ind + 1)
+        else:
+            runs.append((ind, ind + 1))
+    return runs
@@ -20,6 +20,7 @@ class OpenFilesListView(QtWidgets.QListView):
         )
 
         self.setResizeMode(QtWidgets.QListView.ResizeMode.Adjust)
+        self.setUniformItemSizes(True)  # all rows are one line of text + tick
 
 
 class IntegralBackgroundTableView(QtWidgets.QTableView):
@@ -35,7 +36,9 @@ class IntegralBackgroundTableView(QtWidgets.QTableView):
         self.setSizeAdjustPolicy(
             QtWidgets.QAbstractScrollArea.SizeAdjustPolicy.AdjustToContentsOnFirstShow
         )
-        self.resizeColumnsToContents()
+        self.verticalHeader().setSectionResizeMode(
+            QtWidgets.QHeaderView.ResizeMode.Fixed
+        )
 
 
 class IntegralsDisplay(QtWidgets.QTableView):
@@ -51,4 +54,6 @@ class IntegralsDisplay(QtWidgets.QTableView):
         self.setSizeAdjustPolicy(
             QtWidgets.QAbstractScrollArea.SizeAdjustPolicy.AdjustToContents
         )
-        self.resizeColumnsToContents()
+        self.verticalHeader().setSectionResizeMode(
+            QtWidgets.QHeaderView.ResizeMode.Fixed
+        )
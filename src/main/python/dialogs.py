@@ -1,15 +1,25 @@
 """File to show my own PyQtDialogs."""
 
-from typing import List
+from functools import lru_cache
+from typing import Dict, List, Set
 
+from iniabu.data import isotopes_mass_all
 from iniabu.utilities import item_formatter
 from PyQt6 import QtCore, QtGui, QtWidgets
 import numpy as np
 from rimseval import processor_utils as pu
 from rimseval.utilities import ini
 
-from data_models import IntegralBackgroundDefinitionModel, NormIsosModel
+from data_models import (
+    IntegralBackgroundDefinitionModel,
+    MassCalModel,
+    NormIsosModel,
+)
 from data_views import IntegralBackgroundTableView
+import utils
+
+# formatting user input is pure on strings, so results can be shared
+_item_formatter = lru_cache(maxsize=512)(item_formatter)
 
 
 class AboutDialog(QtWidgets.QDialog):
@@ -31,11 +41,8 @@ class AboutDialog(QtWidgets.QDialog):
         """Set the about text for the dialog."""
         layout = QtWidgets.QVBoxLayout()
 
-        font_bold = QtGui.QFont()
-        font_bold.setBold(True)
-
         title = QtWidgets.QLabel(f"RIMSEval {self.version}")
-        title.setFont(font_bold)
+        title.setFont(bold_font())
         layout.addWidget(title)
 
         docs = QtWidgets.QLabel(
@@ -134,18 +141,20 @@ class BackgroundEditDialog(QtWidgets.QDialog):
 
     def accept(self) -> None:
         """Ensure that the names are unique and accept."""
-        peak_list_str = "\n".join(self.peaks)
         self.model.remove_empties()
-        for name in self.model.names:
-            if name not in self.peaks:
-                QtWidgets.QMessageBox.warning(
-                    self,
-                    "Undefined Peak",
-                    f"The given names must be in the background list. However, "
-                    f"{name} is not in the peak list. Valid peaks are:\n"
-                    f"{peak_list_str}",
-                )
-                return
+        peak_set = set(self.peaks)
+        missing = [name for name in self.model.names if name not in peak_set]
+        if missing:
+            peak_list_str = "\n".join(self.peaks)
+            verb = "is" if len(missing) == 1 else "are"
+            QtWidgets.QMessageBox.warning(
+                self,
+                "Undefined Peak",
+                f"The given names must be in the background list. However, "
+                f"{', '.join(missing)} {verb} not in the peak list. Valid peaks "
+                f"are:\n{peak_list_str}",
+            )
+            return
         super().accept()
 
     def add_row(self):
@@ -158,12 +167,8 @@ class BackgroundEditDialog(QtWidgets.QDialog):
 
     def delete_selected(self):
         """Delete selected rows."""
-        selected_indexes = self.table_edit.selectedIndexes()
-        rows = set()
-        for ind in selected_indexes:
-            rows.add(ind.row())
-
-        if len(rows) > 0:
+        rows = selected_rows(self.table_edit)
+        if rows:
             self.model.delete_selected(list(rows))
 
 
@@ -191,35 +196,58 @@ class CheckForUpdatesDialog(QtWidgets.QDialog):
         super().__init__(parent)
 
         self.setWindowTitle("Check for updates...")
-        self.theme = parent.config.get("Theme")
-
-        self.curr_version = curr_version
-        self.latest_version = latest_version
-        self.status = status
 
         self.repo_url_release = (
             "https://github.com/RIMS-Code/RIMSEvalGUI/releases/latest"
         )
 
         self.version_text()
+        self.update_state(curr_version, latest_version, status)
 
     def version_text(self):
-        """Set the about text for the dialog."""
+        """Set up the labels for the dialog, they are filled in ``update_state``."""
         layout = QtWidgets.QVBoxLayout()
 
-        font_status = QtGui.QFont()
-        font_status.setBold(True)
-        tmp_point_size = font_status.pointSize()
-        font_status.setPointSize(tmp_point_size + 4)
+        self._curr_label = QtWidgets.QLabel()
+        layout.addWidget(self._curr_label)
+        self._latest_label = QtWidgets.QLabel()
+        layout.addWidget(self._latest_label)
 
-        curr_version_label = QtWidgets.QLabel(
-            f"Current GUI version:\t{self.curr_version}"
-        )
-        layout.addWidget(curr_version_label)
-        latest_version_label = QtWidgets.QLabel(
-            f"Latest GUI version:\t{self.latest_version}"
+        layout.addStretch()
+
+        self._conc_label = QtWidgets.QLabel()
+        self._conc_label.setFont(bold_font(4))
+        self._conc_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self._conc_label.setFixedHeight(50)
+        layout.addWidget(self._conc_label)
+
+        layout.addStretch()
+        self._link_label = QtWidgets.QLabel()
+        layout.addWidget(self._link_label)
+
+        button_box = QtWidgets.QDialogButtonBox(
+            QtWidgets.QDialogButtonBox.StandardButton.Ok
         )
-        layout.addWidget(latest_version_label)
+        button_box.accepted.connect(self.accept)
+        layout.addWidget(button_box)
+
+        self.setLayout(layout)
+
+    def update_state(self, curr_version: str, latest_version: str, status: int) -> None:
+        """Update the labels such that the dialog can be shown again.
+
+        :param curr_version: Current version of the GUI
+        :param latest_version: Latest version available on GitHub
+        :param status: Status indicator, see ``__init__``.
+        """
+        self.theme = self.parent().config.get("Theme")
+
+        self.curr_version = curr_version
+        self.latest_version = latest_version
+        self.status = status
+
+        self._curr_label.setText(f"Current GUI version:\t{self.curr_version}")
+        self._latest_label.setText(f"Latest GUI version:\t{self.latest_version}")
 
         # determine final text with the conclusion
         disp_update_link = True
@@ -235,29 +263,13 @@ class CheckForUpdatesDialog(QtWidgets.QDialog):
         else:
             conc_text = "Unknown error occurred."
 
-        layout.addStretch()
-
-        conc_widget = QtWidgets.QLabel(conc_text)
-        conc_widget.setFont(font_status)
-        conc_widget.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-        conc_widget.setFixedHeight(50)
-        layout.addWidget(conc_widget)
-
-        if disp_update_link:
-            layout.addStretch()
-            latest_release_label = QtWidgets.QLabel(
-                f"Latest releases can be found here<br>"
-                f"{html_url(self.repo_url_release, theme=self.theme)}"
-            )
-            layout.addWidget(latest_release_label)
+        self._conc_label.setText(conc_text)
 
-        button_box = QtWidgets.QDialogButtonBox(
-            QtWidgets.QDialogButtonBox.StandardButton.Ok
+        self._link_label.setText(
+            f"Latest releases can be found here<br>"
+            f"{html_url(self.repo_url_release, theme=self.theme)}"
         )
-        button_box.accepted.connect(self.accept)
-        layout.addWidget(button_box)
-
-        self.setLayout(layout)
+        self._link_label.setVisible(disp_update_link)
 
 
 class IntegralEditDialog(QtWidgets.QDialog):
@@ -384,12 +396,8 @@ class IntegralEditDialog(QtWidgets.QDialog):
         upper_limit = float(self.upper_limit_autofill.value())
         offset = float(self.mass_offset.value())
 
-        masses += offset
-
-        values = np.zeros((len(names), 2))
-        for it, mass in enumerate(masses):
-            values[it][0] = masses[it] - lower_limit
-            values[it][1] = masses[it] + upper_limit
+        masses = np.asarray(masses, dtype=float) + offset
+        values = np.column_stack((masses - lower_limit, masses + upper_limit))
 
         self.model.add_element(names, values)
 
@@ -400,20 +408,24 @@ class IntegralEditDialog(QtWidgets.QDialog):
     def auto_fill_values(self):
         """Automatically fill the values for the integrals based on mass or isotope."""
         self.model.remove_empties()
-        masses = []
-        for item in self.model.names:
-            try:
-                masses.append(float(item))  # user gave a mass
-            except ValueError:
+        names = self.model.names
+        try:
+            masses = np.asarray(names, dtype=float)  # user gave masses only
+        except ValueError:
+            masses = np.empty(len(names))
+            for it, item in enumerate(names):
                 try:
-                    masses.append(ini.iso[item].mass)  # user gave an isotope
-                except IndexError:
-                    QtWidgets.QMessageBox.warning(
-                        self,
-                        "Invalid mass",
-                        f"Cannot determine a mass for entry {item}.",
-                    )
-                    return None
+                    masses[it] = float(item)  # user gave a mass
+                except ValueError:
+                    try:
+                        masses[it] = iso_mass(item)  # user gave an isotope
+                    except IndexError:
+                        QtWidgets.QMessageBox.warning(
+                            self,
+                            "Invalid mass",
+                            f"Cannot determine a mass for entry {item}.",
+                        )
+                        return None
         self.model.auto_fill(
             masses, self.lower_limit_autofill.value(), self.upper_limit_autofill.value()
         )
@@ -424,12 +436,8 @@ class IntegralEditDialog(QtWidgets.QDialog):
 
     def delete_selected(self):
         """Delete selected rows."""
-        selected_indexes = self.table_edit.selectedIndexes()
-        rows = set()
-        for ind in selected_indexes:
-            rows.add(ind.row())
-
-        if len(rows) > 0:
+        rows = selected_rows(self.table_edit)
+        if rows:
             self.model.delete_selected(list(rows))
 
 
@@ -459,20 +467,20 @@ class MassCalDialog(QtWidgets.QDialog):
         self.setLayout(self.layout)
 
     def fill_mcal_data(self):
-        """Fill the layout with some data from the mass calibration."""
-        hdr_font = QtGui.QFont()
-        hdr_font.setBold(True)
-
-        tmp_hbox = QtWidgets.QHBoxLayout()
-        tmp_hbox.addWidget(QtWidgets.QLabel("ToF (us)"))
-        tmp_hbox.addWidget(QtWidgets.QLabel("Mass (amu)"))
-        self.layout.addLayout(tmp_hbox)
+        """Fill the layout with a table view of the mass calibration."""
+        self.model = MassCalModel(self.mcal)
+
+        table = QtWidgets.QTableView()
+        table.setModel(self.model)
+        table.verticalHeader().hide()
+        for header in (table.horizontalHeader(), table.verticalHeader()):
+            header.setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Fixed)
+        table.horizontalHeader().setDefaultSectionSize(100)
+        table.setSizeAdjustPolicy(
+            QtWidgets.QAbstractScrollArea.SizeAdjustPolicy.AdjustToContents
+        )
 
-        for tm, ms in self.mcal:
-            tmp_hbox = QtWidgets.QHBoxLayout()
-            tmp_hbox.addWidget(QtWidgets.QLabel(f"{tm:.3f}"))
-            tmp_hbox.addWidget(QtWidgets.QLabel(f"{ms:.3f}"))
-            self.layout.addLayout(tmp_hbox)
+        self.layout.addWidget(table)
 
 
 class NormIsosDialog(QtWidgets.QDialog):
@@ -489,6 +497,10 @@ class NormIsosDialog(QtWidgets.QDialog):
 
         self.data = data
 
+        # valid names as accepted by ``ini.ele`` and ``ini.iso``, for O(1) checks
+        self._valid_eles = frozenset(ini.ele_dict.keys())
+        self._valid_isos = self._valid_eles.union(isotopes_mass_all.keys())
+
         self.setWindowTitle("Set / Edit Normalization Isotopes")
 
         self.add_ele = QtWidgets.QLineEdit()
@@ -558,8 +570,8 @@ class NormIsosDialog(QtWidgets.QDialog):
             return None
 
         try:
-            ele = item_formatter(ele)
-            iso = item_formatter(iso)
+            ele = _item_formatter(ele)
+            iso = _item_formatter(iso)
         except Exception as err:
             QtWidgets.QMessageBox.warning(
                 self, "Error occurred when parsing element / isotope name", err.args[0]
@@ -574,9 +586,7 @@ class NormIsosDialog(QtWidgets.QDialog):
             return None
 
         # try valid element
-        try:
-            _ = ini.ele[ele]
-        except IndexError:
+        if ele not in self._valid_eles:
             QtWidgets.QMessageBox.warning(
                 self,
                 "Element invalid",
@@ -585,9 +595,7 @@ class NormIsosDialog(QtWidgets.QDialog):
             return None
 
         # try valid isotope
-        try:
-            _ = ini.iso[iso]
-        except IndexError:
+        if iso not in self._valid_isos:
             QtWidgets.QMessageBox.warning(
                 self,
                 "Isotope invalid",
@@ -605,12 +613,8 @@ class NormIsosDialog(QtWidgets.QDialog):
 
     def delete_selected(self):
         """Delete selected rows."""
-        selected_indexes = self.table_edit.selectedIndexes()
-        rows = set()
-        for ind in selected_indexes:
-            rows.add(ind.row())
-
-        if len(rows) > 0:
+        rows = selected_rows(self.table_edit)
+        if rows:
             self.model.delete_selected(list(rows))
 
     def help(self):
@@ -627,6 +631,54 @@ class NormIsosDialog(QtWidgets.QDialog):
 # METHODS #
 
 
+@utils.release_on_quit
+@lru_cache(maxsize=None)
+def bold_font(delta_pt: int = 0) -> QtGui.QFont:
+    """Return a bold version of the default font, shared between all dialogs.
+
+    Widgets copy the font in ``setFont``, so the returned font must not be modified.
+
+    :param delta_pt: Increase of the point size with respect to the default font.
+
+    :return: Bold font.
+    """
+    font = QtGui.QFont()
+    font.setBold(True)
+    if delta_pt:
+        font.setPointSize(font.pointSize() + delta_pt)
+    return font
+
+
+@lru_cache(maxsize=512)
+def iso_mass(iso: str) -> float:
+    """Return the mass of an isotope, cached for repeated lookups.
+
+    :param iso: Name of the isotope, e.g., "Ti-46".
+
+    :return: Mass of the isotope in amu.
+
+    :raises IndexError: The isotope is not in the database.
+    """
+    mass = stable_iso_masses().get(iso)
+    if mass is None:
+        mass = ini.iso[iso].mass
+    return mass
+
+
+@lru_cache(maxsize=1)
+def stable_iso_masses() -> Dict[str, float]:
+    """Return a dictionary of all stable isotope masses.
+
+    The table is built with a single, vectorized database query the first time
+    it is requested.
+
+    :return: Dictionary with isotope names as keys and masses in amu as values.
+    """
+    isos = list(ini.iso_dict.keys())
+    return dict(zip(isos, ini.iso[isos].mass.tolist()))
+
+
+@lru_cache(maxsize=64)
 def html_url(url: str, name: str = None, theme: str = "") -> str:
     """Create a HTML string for the URL and return it.
 
@@ -645,3 +697,13 @@ def html_url(url: str, name: str = None, theme: str = "") -> str:
         name = url
     retval = f'<a href="{url}" style="color:{color}">{name}</a>'
     return retval
+
+
+def selected_rows(view: QtWidgets.QAbstractItemView) -> Set[int]:
+    """Return the rows in which any cell of the view is selected.
+
+    :param view: Table or list view.
+
+    :return: Set of selected row indexes.
+    """
+    return {ind.row() for ind in view.selectedIndexes()}
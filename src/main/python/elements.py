@@ -1,5 +1,6 @@
 """PyQt interface to query elements."""
 
+from functools import lru_cache, partial
 from typing import Tuple
 import sys
 
@@ -19,6 +20,8 @@ import numpy as np
 
 from rimseval.utilities import ini
 
+import utils
+
 
 class PeriodicTable(QMainWindow):
     """Periodic table main window with clickable buttons for all elements."""
@@ -37,6 +40,9 @@ class PeriodicTable(QMainWindow):
         self.main_layout = QGridLayout()
         main_widget.setLayout(self.main_layout)
 
+        # mass spectrum drawings of opened elements, keyed by element name
+        self.ms_pixmaps = {}
+
         self.create_buttons()
 
     def closeEvent(self, a0: QtGui.QCloseEvent) -> None:
@@ -44,18 +50,39 @@ class PeriodicTable(QMainWindow):
         self.parent.window_elements_action.setChecked(False)
         super().closeEvent(a0)
 
+    def ms_pixmap(self, ele: str) -> QtGui.QPixmap:
+        """Return the drawing of the mass spectrum of an element.
+
+        The drawing only depends on the element, so it is rendered once and then
+        reused when the element is opened again.
+
+        :param ele: Element name.
+
+        :return: Pixmap of the mass spectrum.
+        """
+        if (canvas := self.ms_pixmaps.get(ele)) is None:
+            canvas = ElementInfo.draw_ms(ele)
+            self.ms_pixmaps[ele] = canvas
+        return canvas
+
     def create_buttons(self) -> None:
         """Creates buttons for all elements and aligns them on the main widget."""
         eles = list(ini.ele_dict.keys())
 
+        # one style sheet string per background color, shared by all its buttons
+        style_sheets = {
+            color: f"background-color: {color}; color: '#444444';"
+            for _, _, color in _POSITIONS_COLORS.values()
+        }
+
         for ele in eles:
             button = QPushButton(ele)
-            button.pressed.connect(lambda val=ele: self.open_element(val))
+            button.pressed.connect(partial(self.open_element, ele))
             button.setFixedWidth(40)
             button.setFixedHeight(40)
 
             row, col, color = element_position_color(ele)
-            button.setStyleSheet(f"background-color: {color}; color: '#444444';")
+            button.setStyleSheet(style_sheets[color])
             self.main_layout.addWidget(button, row, col)
 
         # labels for lanthanides and actinides
@@ -97,9 +124,11 @@ class ElementInfo(QDialog):
 
         self.ele = ele
 
-        self.font_ele = QtGui.QFont()
-        self.font_ele.setBold(True)
-        self.font_ele.setPixelSize(32)
+        # isotope data, always as sequences, also for mono-isotopic elements
+        isos = ini.iso[self.ele]
+        self._names = isos.name if isinstance(isos.name, list) else [isos.name]
+        self._abus = np.atleast_1d(isos.abu_rel)
+        self._masses = np.atleast_1d(isos.mass)
 
         # layout
         main_layout = QHBoxLayout()
@@ -127,7 +156,7 @@ class ElementInfo(QDialog):
         zz = ini.ele[self.ele].z
         ele_layout = QHBoxLayout()
         lbl = QLabel(f"<sub>{zz}</sub>{self.ele}")
-        lbl.setFont(self.font_ele)
+        lbl.setFont(element_font())
         ele_layout.addStretch()
         ele_layout.addWidget(lbl)
         ele_layout.addStretch()
@@ -136,19 +165,36 @@ class ElementInfo(QDialog):
         self.left_layout.addStretch()
 
         # draw MS
-        isos = ini.iso[self.ele]
-        abus = isos.abu_rel
-        masses = isos.a
-
         drawing = QLabelClickable("")
         drawing.setToolTip("Click to copy all abundances to clipboard")
 
+        # connect abus to clickable label
+        abus_str = "\t".join([str(tmp) for tmp in self._abus]) + "\n"
+        drawing.clicked.connect(partial(self.copy_to_clipboard, abus_str))
+
+        drawing.setPixmap(self.parent().ms_pixmap(self.ele))
+        self.left_layout.addWidget(drawing)
+
+    @staticmethod
+    def draw_ms(ele: str) -> QtGui.QPixmap:
+        """Draw the mass spectrum of an element.
+
+        :param ele: Element name.
+
+        :return: Pixmap of the mass spectrum.
+        """
+        isos = ini.iso[ele]
+        abus = isos.abu_rel
+        masses = isos.a
+
         width = 150
         height = 100
-        canvas = QtGui.QPixmap(width, height)
-        canvas.fill(QtGui.QColor("#c3d0ff"))
+        image = QtGui.QImage(
+            width, height, QtGui.QImage.Format.Format_ARGB32_Premultiplied
+        )
+        image.fill(QtGui.QColor("#c3d0ff"))
 
-        painter = QtGui.QPainter(canvas)
+        painter = QtGui.QPainter(image)
         pen = QtGui.QPen()
 
         # draw mass lines
@@ -171,22 +217,19 @@ class ElementInfo(QDialog):
         xpos_shift = int((max_mass_spacing - mass_spacing) * iso_spacing / 2)
         max_height = height - 2 * spacing
 
-        for it, abu in enumerate(abus):  # note: painting starts top left as 0,0
-            if abu != 0:
-                xpos = int(
-                    spacing + (masses[it] - masses.min()) * iso_spacing + xpos_shift
-                )
-                ystart = int(spacing + max_height * (1 - abu / abu_max))
-                painter.drawLine(xpos, ystart, xpos, height - spacing)
+        # only isotopes with abundance are drawn, painting starts top left as 0,0
+        drawn = abus != 0
+        xpos = spacing + (masses[drawn] - masses.min()) * iso_spacing + xpos_shift
+        ystart = spacing + max_height * (1 - abus[drawn] / abu_max)
+        lines = [
+            QtCore.QLine(xp, ys, xp, height - spacing)
+            for xp, ys in zip(xpos.astype(int).tolist(), ystart.astype(int).tolist())
+        ]
+        painter.drawLines(lines)
 
         painter.end()
 
-        # connect abus to clickable label
-        abus_str = "\t".join([str(tmp) for tmp in abus]) + "\n"
-        drawing.clicked.connect(lambda val=abus_str: self.copy_to_clipboard(val))
-
-        drawing.setPixmap(canvas)
-        self.left_layout.addWidget(drawing)
+        return QtGui.QPixmap.fromImage(image)
 
     def element_data(self) -> None:
         """Create table for element information: the data."""
@@ -195,45 +238,29 @@ class ElementInfo(QDialog):
         layout_abus = QVBoxLayout()
 
         # titles
-        font_italic = QtGui.QFont()
-        font_italic.setItalic(True)
         hdr_names = QLabel("Isotope")
-        hdr_names.setFont(font_italic)
+        hdr_names.setFont(italic_font())
         hdr_masses = QLabel("Mass")
-        hdr_masses.setFont(font_italic)
+        hdr_masses.setFont(italic_font())
         hdr_abus = QLabel("Rel. Abundance")
-        hdr_abus.setFont(font_italic)
+        hdr_abus.setFont(italic_font())
         layout_names.addWidget(hdr_names)
         layout_masses.addWidget(hdr_masses)
         layout_abus.addWidget(hdr_abus)
 
-        isos = ini.iso[self.ele]
-        names = isos.name
-        abus = isos.abu_rel
-        masses = isos.mass
-
-        if not isinstance(names, list):
-            names = [names]
-            abus = np.array([abus])
-            masses = np.array([masses])
-
         # fill layout
-        for name, abu, mass in zip(names, abus, masses):
+        for name, abu, mass in zip(self._names, self._abus, self._masses):
             a, ele = split_iso_name(name)
             name_label = QLabel(f"<sup>{a}</sup>{ele}")
 
             mass_label = QLabelClickable(f"{mass:.2f}")
             mass_label.setToolTip("Click to copy to clipboard")
             mass_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
-            mass_label.clicked.connect(
-                lambda val=f"{mass}\n": self.copy_to_clipboard(val)
-            )
+            mass_label.clicked.connect(partial(self.copy_to_clipboard, f"{mass}\n"))
             abu_label = QLabelClickable(f"{abu:.5f}")
             abu_label.setToolTip("Click to copy to clipboard")
             abu_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
-            abu_label.clicked.connect(
-                lambda val=f"{abu}\n": self.copy_to_clipboard(val)
-            )
+            abu_label.clicked.connect(partial(self.copy_to_clipboard, f"{abu}\n"))
 
             layout_names.addWidget(name_label)
             layout_masses.addWidget(mass_label)
@@ -264,6 +291,142 @@ class QLabelClickable(QLabel):
         self.clicked.emit()
 
 
+# grid position (row, column) and background color of each element
+_POSITIONS_COLORS = {
+    "H": (0, 0, "#ffffc7"),
+    "He": (0, 17, "#ffe4bb"),
+    "Li": (1, 0, "#ffc9c9"),
+    "Be": (1, 1, "#d7d7ff"),
+    "B": (1, 12, "#e1eebd"),
+    "C": (1, 13, "#ffffc7"),
+    "N": (1, 14, "#ffffc7"),
+    "O": (1, 15, "#ffffc7"),
+    "F": (1, 16, "#ffffc7"),
+    "Ne": (1, 17, "#ffe4bb"),
+    "Na": (2, 0, "#ffc9c9"),
+    "Mg": (2, 1, "#d7d7ff"),
+    "Al": (2, 12, "#c8ffc8"),
+    "Si": (2, 13, "#e1eebd"),
+    "P": (2, 14, "#ffffc7"),
+    "S": (2, 15, "#ffffc7"),
+    "Cl": (2, 16, "#ffffc7"),
+    "Ar": (2, 17, "#ffe4bb"),
+    "K": (3, 0, "#ffc9c9"),
+    "Ca": (3, 1, "#d7d7ff"),
+    "Sc": (3, 2, "#bbddff"),
+    "Ti": (3, 3, "#bbddff"),
+    "V": (3, 4, "#bbddff"),
+    "Cr": (3, 5, "#bbddff"),
+    "Mn": (3, 6, "#bbddff"),
+    "Fe": (3, 7, "#bbddff"),
+    "Co": (3, 8, "#bbddff"),
+    "Ni": (3, 9, "#bbddff"),
+    "Cu": (3, 10, "#bbddff"),
+    "Zn": (3, 11, "#bbddff"),
+    "Ga": (3, 12, "#c8ffc8"),
+    "Ge": (3, 13, "#e1eebd"),
+    "As": (3, 14, "#e1eebd"),
+    "Se": (3, 15, "#ffffc7"),
+    "Br": (3, 16, "#ffffc7"),
+    "Kr": (3, 17, "#ffe4bb"),
+    "Rb": (4, 0, "#ffc9c9"),
+    "Sr": (4, 1, "#d7d7ff"),
+    "Y": (4, 2, "#bbddff"),
+    "Zr": (4, 3, "#bbddff"),
+    "Nb": (4, 4, "#bbddff"),
+    "Mo": (4, 5, "#bbddff"),
+    "Tc": (4, 6, "#bbddff"),
+    "Ru": (4, 7, "#bbddff"),
+    "Rh": (4, 8, "#bbddff"),
+    "Pd": (4, 9, "#bbddff"),
+    "Ag": (4, 10, "#bbddff"),
+    "Cd": (4, 11, "#bbddff"),
+    "In": (4, 12, "#c8ffc8"),
+    "Sn": (4, 13, "#c8ffc8"),
+    "Sb": (4, 14, "#e1eebd"),
+    "Te": (4, 15, "#e1eebd"),
+    "I": (4, 16, "#ffffc7"),
+    "Xe": (4, 17, "#ffe4bb"),
+    "Cs": (5, 0, "#ffc9c9"),
+    "Ba": (5, 1, "#d7d7ff"),
+    "Hf": (5, 3, "#bbddff"),
+    "Ta": (5, 4, "#bbddff"),
+    "W": (5, 5, "#bbddff"),
+    "Re": (5, 6, "#bbddff"),
+    "Os": (5, 7, "#bbddff"),
+    "Ir": (5, 8, "#bbddff"),
+    "Pt": (5, 9, "#bbddff"),
+    "Au": (5, 10, "#bbddff"),
+    "Hg": (5, 11, "#bbddff"),
+    "Tl": (5, 12, "#c8ffc8"),
+    "Pb": (5, 13, "#c8ffc8"),
+    "Bi": (5, 14, "#c8ffc8"),
+    "Po": (5, 15, "#e1eebd"),
+    "At": (5, 16, "#ffffc7"),
+    "Rn": (5, 17, "#ffe4bb"),
+    "Fr": (6, 0, "#ffc9c9"),
+    "Ra": (6, 1, "#d7d7ff"),
+    "Rf": (6, 3, "#bbddff"),
+    "Db": (6, 4, "#bbddff"),
+    "Sg": (6, 5, "#bbddff"),
+    "Bh": (6, 6, "#bbddff"),
+    "Hs": (6, 7, "#bbddff"),
+    "Mt": (6, 8, "#bbddff"),
+    "Ds": (6, 9, "#bbddff"),
+    "Rg": (6, 10, "#bbddff"),
+    "Cn": (6, 11, "#bbddff"),
+    "Nh": (6, 12, "#c8ffc8"),
+    "Fl": (6, 13, "#c8ffc8"),
+    "Mc": (6, 14, "#c8ffc8"),
+    "Lv": (6, 15, "#c8ffc8"),
+    "Ts": (6, 16, "#ffffc7"),
+    "Og": (6, 17, "#ffe4bb"),
+    "La": (7, 3, "#b9ffff"),
+    "Ce": (7, 4, "#b9ffff"),
+    "Pr": (7, 5, "#b9ffff"),
+    "Nd": (7, 6, "#b9ffff"),
+    "Pm": (7, 7, "#b9ffff"),
+    "Sm": (7, 8, "#b9ffff"),
+    "Eu": (7, 9, "#b9ffff"),
+    "Gd": (7, 10, "#b9ffff"),
+    "Tb": (7, 11, "#b9ffff"),
+    "Dy": (7, 12, "#b9ffff"),
+    "Ho": (7, 13, "#b9ffff"),
+    "Er": (7, 14, "#b9ffff"),
+    "Tm": (7, 15, "#b9ffff"),
+    "Yb": (7, 16, "#b9ffff"),
+    "Lu": (7, 17, "#b9ffff"),
+    "Ac": (8, 3, "#cdffee"),
+    "Th": (8, 4, "#cdffee"),
+    "Pa": (8, 5, "#cdffee"),
+    "U": (8, 6, "#cdffee"),
+    "Np": (8, 7, "#cdffee"),
+    "Pu": (8, 8, "#cdffee"),
+    "Am": (8, 9, "#cdffee"),
+    "Cm": (8, 10, "#cdffee"),
+    "Bk": (8, 11, "#cdffee"),
+    "Cf": (8, 12, "#cdffee"),
+    "Es": (8, 13, "#cdffee"),
+    "Fm": (8, 14, "#cdffee"),
+    "Md": (8, 15, "#cdffee"),
+    "No": (8, 16, "#cdffee"),
+    "Lr": (8, 17, "#cdffee"),
+}
+
+
+@utils.release_on_quit
+@lru_cache(maxsize=1)
+def element_font() -> QtGui.QFont:
+    """Return the large, bold font for element symbols, shared between dialogs.
+
+    :return: Font for the element symbol.
+    """
+    font = QtGui.QFont()
+    font.setBold(True)
+    font.setPixelSize(32)
+    return font
+
+
 def element_position_color(ele: str) -> Tuple[int, int, str]:
     """Return the position of an element in grid view.
 
@@ -271,140 +434,34 @@ def element_position_color(ele: str) -> Tuple[int, int, str]:
 
     :return: Row, Column position and color as HEX.
     """
-    positions_colors = {
-        "H": (0, 0, "#ffffc7"),
-        "He": (0, 17, "#ffe4bb"),
-        "Li": (1, 0, "#ffc9c9"),
-        "Be": (1, 1, "#d7d7ff"),
-        "B": (1, 12, "#e1eebd"),
-        "C": (1, 13, "#ffffc7"),
-        "N": (1, 14, "#ffffc7"),
-        "O": (1, 15, "#ffffc7"),
-        "F": (1, 16, "#ffffc7"),
-        "Ne": (1, 17, "#ffe4bb"),
-        "Na": (2, 0, "#ffc9c9"),
-        "Mg": (2, 1, "#d7d7ff"),
-        "Al": (2, 12, "#c8ffc8"),
-        "Si": (2, 13, "#e1eebd"),
-        "P": (2, 14, "#ffffc7"),
-        "S": (2, 15, "#ffffc7"),
-        "Cl": (2, 16, "#ffffc7"),
-        "Ar": (2, 17, "#ffe4bb"),
-        "K": (3, 0, "#ffc9c9"),
-        "Ca": (3, 1, "#d7d7ff"),
-        "Sc": (3, 2, "#bbddff"),
-        "Ti": (3, 3, "#bbddff"),
-        "V": (3, 4, "#bbddff"),
-        "Cr": (3, 5, "#bbddff"),
-        "Mn": (3, 6, "#bbddff"),
-        "Fe": (3, 7, "#bbddff"),
-        "Co": (3, 8, "#bbddff"),
-        "Ni": (3, 9, "#bbddff"),
-        "Cu": (3, 10, "#bbddff"),
-        "Zn": (3, 11, "#bbddff"),
-        "Ga": (3, 12, "#c8ffc8"),
-        "Ge": (3, 13, "#e1eebd"),
-        "As": (3, 14, "#e1eebd"),
-        "Se": (3, 15, "#ffffc7"),
-        "Br": (3, 16, "#ffffc7"),
-        "Kr": (3, 17, "#ffe4bb"),
-        "Rb": (4, 0, "#ffc9c9"),
-        "Sr": (4, 1, "#d7d7ff"),
-        "Y": (4, 2, "#bbddff"),
-        "Zr": (4, 3, "#bbddff"),
-        "Nb": (4, 4, "#bbddff"),
-        "Mo": (4, 5, "#bbddff"),
-        "Tc": (4, 6, "#bbddff"),
-        "Ru": (4, 7, "#bbddff"),
-        "Rh": (4, 8, "#bbddff"),
-        "Pd": (4, 9, "#bbddff"),
-        "Ag": (4, 10, "#bbddff"),
-        "Cd": (4, 11, "#bbddff"),
-        "In": (4, 12, "#c8ffc8"),
-        "Sn": (4, 13, "#c8ffc8"),
-        "Sb": (4, 14, "#e1eebd"),
-        "Te": (4, 15, "#e1eebd"),
-        "I": (4, 16, "#ffffc7"),
-        "Xe": (4, 17, "#ffe4bb"),
-        "Cs": (5, 0, "#ffc9c9"),
-        "Ba": (5, 1, "#d7d7ff"),
-        "Hf": (5, 3, "#bbddff"),
-        "Ta": (5, 4, "#bbddff"),
-        "W": (5, 5, "#bbddff"),
-        "Re": (5, 6, "#bbddff"),
-        "Os": (5, 7, "#bbddff"),
-        "Ir": (5, 8, "#bbddff"),
-        "Pt": (5, 9, "#bbddff"),
-        "Au": (5, 10, "#bbddff"),
-        "Hg": (5, 11, "#bbddff"),
-        "Tl": (5, 12, "#c8ffc8"),
-        "Pb": (5, 13, "#c8ffc8"),
-        "Bi": (5, 14, "#c8ffc8"),
-        "Po": (5, 15, "#e1eebd"),
-        "At": (5, 16, "#ffffc7"),
-        "Rn": (5, 17, "#ffe4bb"),
-        "Fr": (6, 0, "#ffc9c9"),
-        "Ra": (6, 1, "#d7d7ff"),
-        "Rf": (6, 3, "#bbddff"),
-        "Db": (6, 4, "#bbddff"),
-        "Sg": (6, 5, "#bbddff"),
-        "Bh": (6, 6, "#bbddff"),
-        "Hs": (6, 7, "#bbddff"),
-        "Mt": (6, 8, "#bbddff"),
-        "Ds": (6, 9, "#bbddff"),
-        "Rg": (6, 10, "#bbddff"),
-        "Cn": (6, 11, "#bbddff"),
-        "Nh": (6, 12, "#c8ffc8"),
-        "Fl": (6, 13, "#c8ffc8"),
-        "Mc": (6, 14, "#c8ffc8"),
-        "Lv": (6, 15, "#c8ffc8"),
-        "Ts": (6, 16, "#ffffc7"),
-        "Og": (6, 17, "#ffe4bb"),
-        "La": (7, 3, "#b9ffff"),
-        "Ce": (7, 4, "#b9ffff"),
-        "Pr": (7, 5, "#b9ffff"),
-        "Nd": (7, 6, "#b9ffff"),
-        "Pm": (7, 7, "#b9ffff"),
-        "Sm": (7, 8, "#b9ffff"),
-        "Eu": (7, 9, "#b9ffff"),
-        "Gd": (7, 10, "#b9ffff"),
-        "Tb": (7, 11, "#b9ffff"),
-        "Dy": (7, 12, "#b9ffff"),
-        "Ho": (7, 13, "#b9ffff"),
-        "Er": (7, 14, "#b9ffff"),
-        "Tm": (7, 15, "#b9ffff"),
-        "Yb": (7, 16, "#b9ffff"),
-        "Lu": (7, 17, "#b9ffff"),
-        "Ac": (8, 3, "#cdffee"),
-        "Th": (8, 4, "#cdffee"),
-        "Pa": (8, 5, "#cdffee"),
-        "U": (8, 6, "#cdffee"),
-        "Np": (8, 7, "#cdffee"),
-        "Pu": (8, 8, "#cdffee"),
-        "Am": (8, 9, "#cdffee"),
-        "Cm": (8, 10, "#cdffee"),
-        "Bk": (8, 11, "#cdffee"),
-        "Cf": (8, 12, "#cdffee"),
-        "Es": (8, 13, "#cdffee"),
-        "Fm": (8, 14, "#cdffee"),
-        "Md": (8, 15, "#cdffee"),
-        "No": (8, 16, "#cdffee"),
-        "Lr": (8, 17, "#cdffee"),
-    }
-
-    return positions_colors[ele]
+    return _POSITIONS_COLORS[ele]
 
 
+@lru_cache(maxsize=1)
 def get_max_mass_spacing() -> int:
     """Get the maximum number of isotopes available in this database."""
-    retval = 0
-    for ele in list(ini.ele_dict.keys()):
-        isos_a = ini.iso[ele].a
-        if (dm := isos_a.max() - isos_a.min()) > retval:
-            retval = dm
-    return retval
+    # mass numbers of each element's isotopes are the second entry in ``ele_dict``
+    spans = np.fromiter(
+        (max(entry[1]) - min(entry[1]) for entry in ini.ele_dict.values()),
+        dtype=np.int64,
+        count=len(ini.ele_dict),
+    )
+    return int(spans.max())
+
+
+@utils.release_on_quit
+@lru_cache(maxsize=1)
+def italic_font() -> QtGui.QFont:
+    """Return the italic font for table headers, shared between dialogs.
+
+    :return: Italic font.
+    """
+    font = QtGui.QFont()
+    font.setItalic(True)
+    return font
 
 
+@lru_cache(maxsize=1024)
 def split_iso_name(iso: str) -> Tuple[int, str]:
     """Split an isotope name into its components.
 
@@ -418,6 +475,7 @@ def split_iso_name(iso: str) -> Tuple[int, str]:
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    utils.release_caches_on_quit(app)
     window = PeriodicTable()
     window.show()
     app.exec()
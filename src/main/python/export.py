@@ -19,38 +19,28 @@ def export_histogram(
     :param dx: Bin width.
     """
     # determine the minimum and maximum x value
-    xmin = xdata[0].min()
-    xmax = xdata[0].max()
-    for it in range(1, len(xdata)):
-        xdat = xdata[it]
-        if (mintmp := xdat.min()) < xmin:
-            xmin = mintmp
-        if (maxtmp := xdat.max()) > xmax:
-            xmax = maxtmp
+    xmin = min(xdat.min() for xdat in xdata)
+    xmax = max(xdat.max() for xdat in xdata)
 
     # create the data arrays that need to be written into the csv file
     xarr = np.arange(xmin, xmax + dx, dx)
     yarr = np.zeros((len(ydata), len(xarr)))
 
-    def hist_mapper(xval: float):
-        """Map an x value to the index the counts will go into in the histogram.
-
-        :param xval: Value of x.
-        """
-        slope = 1 / dx
-        return int(slope * (xval - xmin))
-
-    # fill the histograms
+    # fill the histograms: map x values to bin indexes and sum the counts per bin
+    slope = 1 / dx
     for it, ydat in enumerate(ydata):
-        for jt, xval in enumerate(xdata[it]):
-            ind = hist_mapper(xval)
-            yarr[it][ind] += ydat[jt]
+        ind = (slope * (np.asarray(xdata[it]) - xmin)).astype(np.intp)
+        np.clip(ind, 0, len(xarr) - 1, out=ind)
+        yarr[it] = np.bincount(
+            ind, weights=np.asarray(ydat, dtype=float), minlength=len(xarr)
+        )
+
+    # header, then data transposed once to one list of counts per bin
+    lines = [f"{xtitle},{','.join(names)}\n"]
+    lines.extend(
+        f"{xval},{','.join(map(str, yrow))}\n"
+        for xval, yrow in zip(xarr.tolist(), yarr.T.tolist())
+    )
 
     with fname.open("w") as fout:
-        # write header
-        fout.write(f"{xtitle},")
-        fout.write(f"{','.join(names)}\n")
-        # write out data
-        for it in range(len(xarr)):
-            fout.write(f"{xarr[it]},")
-            fout.write(f"{','.join(map(str, yarr[:,it]))}\n")
+        fout.write("".join(lines))
@@ -56,7 +56,7 @@ class FileInfoWindow(QtWidgets.QMainWindow):
             self.hdr_polarity,
             self.hdr_bin_length,
             self.hdr_bin_start,
-            self.hdr_bin_length,
+            self.hdr_bin_end,
             self.hdr_xdim,
             self.hdr_ydim,
             self.hdr_shots_per_px,
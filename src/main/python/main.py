@@ -1,10 +1,11 @@
 """Main RIMSEval graphical user interface."""
 
+from functools import lru_cache
 import itertools
 import json
 from pathlib import Path
 import sys
-from typing import Union
+from typing import Any, Callable, List, Union
 
 try:
     from fbs_runtime import PUBLIC_SETTINGS as fbsrt_public_settings
@@ -41,9 +42,6 @@ from dialogs import (
     MassCalDialog,
     NormIsosDialog,
 )
-from elements import PeriodicTable
-from info_window import FileInfoWindow
-from plot_window import PlotWindow
 from statusindicator import StatusIndicator
 import utils
 import widgets
@@ -52,6 +50,8 @@ import widgets
 class MainRimsEvalGui(QtWidgets.QMainWindow):
     """Main GUI for the RIMSEval program."""
 
+    signal_status_message = QtCore.pyqtSignal(str)
+
     def __init__(self, appctxt, is_windows: bool = False):
         """Initialize the main window.
 
@@ -100,6 +100,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         self.settings_menu = menu_bar.addMenu("Settings")
 
         # actions
+        self.open_crd_action = None
         self.open_additional_crd_action = None
         self.unload_crd_action = None
         self.plot_active_spectrum_action = None
@@ -126,6 +127,8 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         self.backgrounds_set_edit_action = None
         self.calculate_single_action = None
         self.calculate_batch_action = None
+        self.lst_convert_action = None
+        self.lst_convert_tagged_action = None
         self.export_mass_spectrum_action = None
         self.export_tof_spectrum_action = None
         self.export_all_mass_spectra_action = None
@@ -165,12 +168,22 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
             QtWidgets.QLabel(),
         ]
         self.control_bg_correction = QtWidgets.QCheckBox()
+        self.control_widgets = []  # all of the above that the user can edit
 
-        # other windows
-        self.elements_window = PeriodicTable(self)
-        self.info_window = FileInfoWindow(self)
-        self.plot_window = PlotWindow(self)
+        # other windows, created when they are first shown
+        self.elements_window = None
+        self.info_window = None
+        self.plot_window = None
         self.tmp_window = None  # container in self for plot windows from package
+        self._update_dialog = None  # reused check for updates dialog
+
+        # worker thread for long running calculations, only one runs at a time
+        self.worker_busy = False
+        self.worker_thread = None
+        self.worker = None
+        self.worker_continuation = None  # called with the result of the worker
+        self.worker_error_title = None
+        self.worker_cancel = False  # stops loops over files in the worker early
 
         # bars and layouts of program
         self.main_widget = QtWidgets.QWidget()
@@ -189,7 +202,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         self.init_main_widget()
         self.init_status_bar()
 
-        self.setStyleSheet(qdarktheme.load_stylesheet(self.config.get("Theme")))
+        self.setStyleSheet(stylesheet(self.config.get("Theme")))
 
         # welcome the user
         self.status_bar.showMessage(
@@ -204,6 +217,35 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         if self.config.get("Check for updates on startup"):
             self.check_for_updates(startup=True)
 
+    def closeEvent(self, a0: QtGui.QCloseEvent) -> None:
+        """Stop a running worker before the window is closed.
+
+        Loops over files in the worker stop after the current file. A batch
+        calculation cannot be interrupted and is waited for.
+        """
+        if self.worker_thread is not None:
+            question = QtWidgets.QMessageBox.question(
+                self,
+                "Calculation running",
+                "A calculation is still running. Do you want to stop it and quit? "
+                "The file that is currently processed will be finished first.",
+            )
+            if question != QtWidgets.QMessageBox.StandardButton.Yes:
+                a0.ignore()
+                return
+
+            # the result is discarded, nothing may continue on the closed window
+            self.worker.finished.disconnect(self.worker_finished)
+            self.worker.failed.disconnect(self.worker_failed)
+            self.worker_cancel = True
+            self.status_bar.showMessage("Stopping the calculation, please wait...")
+            self.status_bar.repaint()
+            self.worker_thread.quit()
+            self.worker_thread.wait()
+            self.worker_thread = None
+            self.worker = None
+        super().closeEvent(a0)
+
     def init_local_profile(self):
         """Initialize a user's local profile, platform dependent."""
         if self.is_windows:
@@ -219,9 +261,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
 
         # OPEN FILE NAMES VIEW #
         self.file_names_view.setModel(self.file_names_model)
-        self.file_names_view.activated.connect(
-            lambda ind: self.current_file_changed(ind)
-        )
+        self.file_names_view.activated.connect(self.current_file_changed)
         self.file_names_view.setToolTip(
             "Double click file to make current.\n"
             "Select multiple with Shift / Ctrl for batch processing."
@@ -403,6 +443,12 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
             ed.textChanged.connect(lambda: self.status_widget.set_status("outdated"))
         for val in all_control_value_edits:
             val.valueChanged.connect(lambda: self.status_widget.set_status("outdated"))
+        self.control_widgets = (
+            all_control_toggles
+            + all_control_text_edits
+            + all_control_value_edits
+            + [self.control_macro[1]]
+        )
 
         # INTEGRALS VIEW #
         integral_display = IntegralsDisplay(self)
@@ -430,6 +476,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         open_crd_action.triggered.connect(self.open_crd)
         self.file_menu.addAction(open_crd_action)
         tool_bar.addAction(open_crd_action)
+        self.open_crd_action = open_crd_action
 
         open_additional_crd_action = QtGui.QAction(
             QtGui.QIcon(None), "Open additional CRD(s)", self
@@ -457,7 +504,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         plot_active_spectrum_action.setStatusTip(
             "Plot spectrum of currently active CRD file."
         )
-        plot_active_spectrum_action.triggered.connect(self.update_plot_window)
+        plot_active_spectrum_action.triggered.connect(self.plot_active_spectrum)
         self.file_menu.addSeparator()
         self.file_menu.addAction(plot_active_spectrum_action)
         self.plot_active_spectrum_action = plot_active_spectrum_action
@@ -478,7 +525,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
             self,
         )
         load_cal_action.setStatusTip("Load calibration file")
-        load_cal_action.triggered.connect(lambda: self.load_calibration(fname=None))
+        load_cal_action.triggered.connect(self.load_calibration)
         self.file_menu.addSeparator()
         self.file_menu.addAction(load_cal_action)
         self.load_cal_action = load_cal_action
@@ -489,9 +536,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
             self,
         )
         load_lioneval_cal_action.setStatusTip("Load old LIONEval calibration file")
-        load_lioneval_cal_action.triggered.connect(
-            lambda: self.load_lion_eval_calibration(fname=None)
-        )
+        load_lioneval_cal_action.triggered.connect(self.load_lion_eval_calibration)
         self.file_menu.addAction(load_lioneval_cal_action)
         self.load_lioneval_cal_action = load_lioneval_cal_action
 
@@ -514,9 +559,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         )
         save_cal_as_action.setStatusTip("Save calibration to specified file")
         save_cal_as_action.setShortcut(QtGui.QKeySequence("Ctrl+Shift+s"))
-        save_cal_as_action.triggered.connect(
-            lambda: self.save_calibration(save_as=True)
-        )
+        save_cal_as_action.triggered.connect(self.save_calibration_as)
         self.file_menu.addAction(save_cal_as_action)
         self.save_cal_as_action = save_cal_as_action
 
@@ -641,7 +684,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
             "Copy all peak names and integrals to the clipboard"
         )
         integrals_copy_w_names_action.triggered.connect(
-            lambda: self.integrals_copy_to_clipboard(get_names=True)
+            self.integrals_copy_to_clipboard_w_names
         )
         self.integrals_menu.addAction(integrals_copy_w_names_action)
         self.integrals_copy_w_names_action = integrals_copy_w_names_action
@@ -686,7 +729,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
             "Copy peak names and integrals of all packages to the clipboard"
         )
         integrals_copy_pkg_w_names_action.triggered.connect(
-            lambda: self.integrals_pkg_copy_to_clipboard(get_names=True)
+            self.integrals_pkg_copy_to_clipboard_w_names
         )
         self.integrals_menu.addAction(integrals_copy_pkg_w_names_action)
         self.integrals_copy_pkg_w_names_action = integrals_copy_pkg_w_names_action
@@ -710,9 +753,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
             "Save integrals to a user defined csv file."
         )
         integrals_export_as_action.setShortcut(QtGui.QKeySequence("Ctrl+Alt+Shift+s"))
-        integrals_export_as_action.triggered.connect(
-            lambda: self.integrals_save_file(save_as=True)
-        )
+        integrals_export_as_action.triggered.connect(self.integrals_save_file_as)
         self.integrals_menu.addAction(integrals_export_as_action)
         self.integrals_export_as_action = integrals_export_as_action
 
@@ -781,6 +822,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         self.lst_menu.addAction(lst_convert_action)
         tool_bar.addSeparator()
         tool_bar.addAction(lst_convert_action)
+        self.lst_convert_action = lst_convert_action
 
         lst_convert_tagged_action = QtGui.QAction(
             QtGui.QIcon(None),
@@ -788,10 +830,9 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
             self,
         )
         lst_convert_tagged_action.setStatusTip("Convert Tagged LST to CRD file(s)")
-        lst_convert_tagged_action.triggered.connect(
-            lambda: self.convert_lst_to_crd(True)
-        )
+        lst_convert_tagged_action.triggered.connect(self.convert_lst_to_crd_tagged)
         self.lst_menu.addAction(lst_convert_tagged_action)
+        self.lst_convert_tagged_action = lst_convert_tagged_action
 
         # EXPORT ACTIONS #
         export_mass_spectrum_action = QtGui.QAction(
@@ -812,9 +853,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         export_tof_spectrum_action.setStatusTip(
             "Export Time of Flight Spectrum as csv file."
         )
-        export_tof_spectrum_action.triggered.connect(
-            lambda: self.export_spectrum_as_csv(tof=True)
-        )
+        export_tof_spectrum_action.triggered.connect(self.export_tof_spectrum_as_csv)
         self.export_menu.addAction(export_tof_spectrum_action)
         self.export_tof_spectrum_action = export_tof_spectrum_action
 
@@ -826,9 +865,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         export_all_mass_spectra_action.setStatusTip(
             "Export all open Mass Spectra as csv file."
         )
-        export_all_mass_spectra_action.triggered.connect(
-            lambda: self.export_all_open_spectra(tof=False)
-        )
+        export_all_mass_spectra_action.triggered.connect(self.export_all_mass_spectra)
         self.export_menu.addSeparator()
         self.export_menu.addAction(export_all_mass_spectra_action)
         self.export_all_mass_spectra_action = export_all_mass_spectra_action
@@ -841,9 +878,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         export_all_tof_spectra_action.setStatusTip(
             "Export all open Time of Flight Spectra as csv file."
         )
-        export_all_tof_spectra_action.triggered.connect(
-            lambda: self.export_all_open_spectra(tof=True)
-        )
+        export_all_tof_spectra_action.triggered.connect(self.export_all_tof_spectra)
         self.export_menu.addAction(export_all_tof_spectra_action)
         self.export_all_tof_spectra_action = export_all_tof_spectra_action
 
@@ -1002,6 +1037,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
             "Gray:\tNo Files loaded"
         )
         self.status_bar.addPermanentWidget(self.status_widget, stretch=1)
+        self.signal_status_message.connect(self.show_status_message)
 
     def init_config_manager(self):
         """Initialize the configuration manager and load the default configuration."""
@@ -1092,8 +1128,12 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
 
     # FILE MENU FUNCTIONS #
 
+    @QtCore.pyqtSlot()
     def open_crd(self):
         """Open CRD File(s)."""
+        if self.worker_busy:
+            return
+
         file_names = QtWidgets.QFileDialog.getOpenFileNames(
             self,
             "Open CRD File(s)",
@@ -1111,7 +1151,8 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
                     self.crd_files.close_files()
 
                 self.integrals_model.clear_data()
-                self.plot_window.clear_plot()
+                if self.plot_window is not None:
+                    self.plot_window.clear_plot()
 
                 file_paths = [Path(file_name) for file_name in file_names]
 
@@ -1120,7 +1161,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
 
                 self.crd_files = rimseval.MultiFileProcessor(file_paths)
                 self.crd_files.signal_processed.connect(
-                    lambda x: self.update_status_bar_processed(x)
+                    self.update_status_bar_processed
                 )
                 self.crd_files.open_files()  # open, but no read
                 self.crd_files.peak_fwhm = self.config.get("Peak FWHM (us)")
@@ -1144,24 +1185,52 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
                 self.file_names_model.set_new_list(file_paths)
 
                 self.set_controls_from_filters()
+                # header information is available before the files are read
+                self.update_info_window(update_all=True)
 
                 if self.config.get("Calculate on open"):
-                    self.crd_files.read_files()
-                    if self.config.get("Optimize Mass Calibration"):
-                        self.optimize_mass_calibration()
-                    self.calculate_single()
+                    self.start_worker(
+                        self.read_files,
+                        self.read_files_finished,
+                        error_title="Error occurred when opening files",
+                    )
                 else:
                     self.update_action_status()
-
-                self.update_info_window(update_all=True)
         except Exception as err:
             QtWidgets.QMessageBox.warning(
                 self, "Error occurred when opening files", err.args[0]
             )
             self.status_widget.set_status("error")
 
+    def read_files(self) -> None:
+        """Read all open CRD files, runs in a worker thread."""
+        files = self.crd_files.files
+        for it, crd in enumerate(files):
+            if self.worker_cancel:
+                break
+            crd.spectrum_full()
+            self.signal_status_message.emit(
+                f"{crd.fname.name} read, {it + 1}/{len(files)} done."
+            )
+
+    def read_files_finished(self, _) -> None:
+        """Calculate the active file once all files are read."""
+        try:
+            if self.config.get("Optimize Mass Calibration"):
+                self.optimize_mass_calibration()
+            self.calculate_single()
+        except Exception as err:
+            QtWidgets.QMessageBox.warning(
+                self, "Error occurred when opening files", str(err)
+            )
+            self.status_widget.set_status("error")
+
+    @QtCore.pyqtSlot()
     def open_additional_crd(self) -> None:
         """Open additional CRD files."""
+        if self.worker_busy:
+            return
+
         if not self.crd_files:  # No files are open
             self.open_crd()
             return
@@ -1179,24 +1248,50 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
 
                 read_files = self.config.get("Calculate on open")
                 secondary_cal = self.app_local_path.joinpath("calibration.json")
-                self.crd_files.open_additional_files(
-                    file_paths, read_files=read_files, secondary_cal=secondary_cal
+                self.start_worker(
+                    self.open_additional_files,
+                    self.file_names_model.add_to_list,
+                    file_paths,
+                    read_files,
+                    secondary_cal,
+                    error_title="Error occurred when opening additional files",
                 )
 
-                self.file_names_model.add_to_list(file_paths)
-
         except Exception as err:
             QtWidgets.QMessageBox.warning(
                 self, "Error occurred when opening additional files", err.args[0]
             )
             self.status_widget.set_status("error")
 
+    def open_additional_files(
+        self, file_paths: List[Path], read_files: bool, secondary_cal: Path
+    ) -> List[Path]:
+        """Open additional CRD files, runs in a worker thread.
+
+        :param file_paths: Files to open.
+        :param read_files: Read the files after opening?
+        :param secondary_cal: Secondary calibration file for loading calibrations.
+
+        :return: Files that were opened.
+        """
+        for it, fname in enumerate(file_paths):
+            if self.worker_cancel:
+                return file_paths[:it]
+            self.crd_files.open_additional_files(
+                [fname], read_files=read_files, secondary_cal=secondary_cal
+            )
+            self.signal_status_message.emit(
+                f"{fname.name} opened, {it + 1}/{len(file_paths)} done."
+            )
+        return file_paths
+
+    @QtCore.pyqtSlot()
     def unload_selected_crd(self):
         """Close selected CRD files."""
         if not self.crd_files:  # No files are open
             return
 
-        selected_models = self.file_names_view.selectedIndexes()
+        selected_models = self.file_names_view.selectionModel().selectedRows()
         selected_indexes = [it.row() for it in selected_models]
         main_id = self.file_names_model.currently_active
 
@@ -1213,6 +1308,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         # now unload from file list
         self.file_names_model.remove_from_list(selected_indexes, new_main_id)
 
+    @QtCore.pyqtSlot(QtCore.QPoint)
     def show_file_view_cm(self, position) -> None:
         """Show the context menu for file views.
 
@@ -1227,6 +1323,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
 
         menu.exec(self.file_names_view.mapToGlobal(position))
 
+    @QtCore.pyqtSlot()
     def load_calibration(self, fname: Path = None):
         """Load a specific calibration file.
 
@@ -1251,6 +1348,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         if self.config.get("Calculate on open"):
             self.calculate_single()
 
+    @QtCore.pyqtSlot()
     def load_lion_eval_calibration(self, fname: Path = None):
         """Load an old LIONEval calibration file.
 
@@ -1275,6 +1373,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         if self.config.get("Calculate on open"):
             self.calculate_single()
 
+    @QtCore.pyqtSlot()
     def save_calibration(self, save_as: bool = False):
         """Save Calibration.
 
@@ -1300,7 +1399,13 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
             fname=self.app_local_path.joinpath("calibration.json"),
         )
 
+    @QtCore.pyqtSlot()
+    def save_calibration_as(self):
+        """Save calibration to a user specified file."""
+        self.save_calibration(save_as=True)
+
     # MASS CALIBRATION FUNCTIONS #
+    @QtCore.pyqtSlot()
     def apply_mass_calibration(self):
         """Apply an already defined / imported mass calibration."""
         crd = self.current_crd_file
@@ -1312,6 +1417,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
                 self.update_all()
                 self.status_widget.set_status("outdated")
 
+    @QtCore.pyqtSlot()
     def create_mass_calibration(self):
         """Enable user to create a mass calibration."""
         logy = self.config.get("Plot with log y-axis")
@@ -1329,6 +1435,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         self.tmp_window.show()
         self.status_widget.set_status("outdated")
 
+    @QtCore.pyqtSlot()
     def optimize_mass_calibration(self):
         """Optimize a given mass calibration by re-fitting all the peaks."""
         crd = self.current_crd_file
@@ -1345,6 +1452,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
                 self.update_all()
                 self.status_widget.set_status("outdated")
 
+    @QtCore.pyqtSlot()
     def show_mass_calibration(self):
         """Show the current Mass calibration as a QDialog."""
         if (mcal := self.current_crd_file.def_mcal) is not None:
@@ -1353,6 +1461,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
 
     # INTEGRAL DEFINITION FUNCTIONS #
 
+    @QtCore.pyqtSlot()
     def integrals_draw(self):
         """Enable user to draw integrals."""
         logy = self.config.get("Plot with log y-axis")
@@ -1391,6 +1500,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
                 if question == QtWidgets.QMessageBox.StandardButton.Yes:
                     self.current_crd_file.def_backgrounds = bgs_all_corr
 
+    @QtCore.pyqtSlot()
     def integrals_set_edit(self):
         """Enable user to set integrals with a table widget."""
         model = IntegralBackgroundDefinitionModel(self.current_crd_file.def_integrals)
@@ -1408,12 +1518,14 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
 
             self.status_widget.set_status("outdated")
 
+    @QtCore.pyqtSlot()
     def integrals_fitting(self):
         """Define integrals by fitting them."""
         # todo in second version
         self.status_widget.set_status("outdated")
         raise NotImplementedError
 
+    @QtCore.pyqtSlot()
     def integrals_copy_to_clipboard(self, get_names: bool = False):
         """Copy the integrals to the clipboard for pasting into, e.g., Excel.
 
@@ -1422,57 +1534,47 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         get_unc = self.config.get("Copy integrals w/ unc.")
         cp_timestamp = self.config.get("Copy timestamp with integrals")
 
-        ret_str = ""
+        lines = []
 
         crd = self.current_crd_file
         if (integrals := crd.integrals) is not None:
             # header
             if get_names:
-                ret_str += "File Name\tNum of Shots\t"
-                if cp_timestamp:
-                    ret_str += "Time\t"
-                for it, name in enumerate(crd.def_integrals[0]):
-                    ret_str += f"{name}"
-                    if get_unc:
-                        ret_str += f"\t{name}_1sig"
-                    if it < len(crd.def_integrals[0]) - 1:
-                        ret_str += "\t"
-                ret_str += "\n"
+                lines.append(
+                    integrals_header_line(crd.def_integrals[0], get_unc, cp_timestamp)
+                )
 
             # integrals
-            ret_str += f"{crd.fname.with_suffix('').name}\t"
-            ret_str += f"{crd.nof_shots}\t"
+            fields = [crd.fname.stem, crd.nof_shots]
             if cp_timestamp:
-                ret_str += f"{crd.timestamp}\t"
-            for col, val in enumerate(integrals):
-                ret_str += f"{val[0]}\t{val[1]}" if get_unc else f"{val[0]}"
-                if col < len(integrals) - 1:
-                    ret_str += "\t"
-            ret_str += "\n"
+                fields.append(crd.timestamp)
+            lines.append(integrals_line(fields, integrals, get_unc))
+
+        QtWidgets.QApplication.clipboard().setText("".join(lines))
 
-        QtWidgets.QApplication.clipboard().setText(ret_str)
+    @QtCore.pyqtSlot()
+    def integrals_copy_to_clipboard_w_names(self):
+        """Copy integrals with names to the clipboard."""
+        self.integrals_copy_to_clipboard(get_names=True)
 
+    @QtCore.pyqtSlot()
     def integrals_copy_all_to_clipboard(self):
         """Copy all integrals with the filename to the clipboard."""
         get_unc = self.config.get("Copy integrals w/ unc.")
         cp_timestamp = self.config.get("Copy timestamp with integrals")
 
-        ret_str = ""
+        lines = []
 
         for crd in self.crd_files.files:
             if (integrals := crd.integrals) is not None:
-                ret_str += f"{crd.fname.with_suffix('').name}\t"
-                ret_str += f"{crd.nof_shots}\t"
+                fields = [crd.fname.stem, crd.nof_shots]
                 if cp_timestamp:
-                    ret_str += f"{crd.timestamp}\t"
-                for col, val in enumerate(integrals):
-                    ret_str += f"{val[0]}\t{val[1]}" if get_unc else f"{val[0]}"
-                    if col < len(integrals) - 1:
-                        ret_str += "\t"
-                ret_str += "\n"
+                    fields.append(crd.timestamp)
+                lines.append(integrals_line(fields, integrals, get_unc))
 
-        QtWidgets.QApplication.clipboard().setText(ret_str)
+        QtWidgets.QApplication.clipboard().setText("".join(lines))
 
+    @QtCore.pyqtSlot()
     def integrals_pkg_copy_to_clipboard(self, get_names: bool = False):
         """Copy the integrals to the clipboard for pasting into, e.g., Excel.
 
@@ -1488,31 +1590,27 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
 
         get_unc = self.config.get("Copy integrals w/ unc.")
         cp_timestamp = self.config.get("Copy timestamp with integrals")
-        ret_str = ""
+        lines = []
 
         if get_names:
-            names = crd.def_integrals[0]
-            ret_str += "File Name\tNum of Shots\t"
-            if cp_timestamp:
-                ret_str += "Time\t"
-            for col, name in enumerate(names):
-                ret_str += f"{name}\t{name}_1sig" if get_unc else f"{name}"
-                if col < len(names) - 1:
-                    ret_str += "\t"
-            ret_str += "\n"
+            lines.append(
+                integrals_header_line(crd.def_integrals[0], get_unc, cp_timestamp)
+            )
 
+        fname = crd.fname.stem
         for it, row in enumerate(data):
-            ret_str += f"{crd.fname.with_suffix('').name}\t"
-            ret_str += f"{crd.nof_shots_pkg[it]}\t"
+            fields = [fname, crd.nof_shots_pkg[it]]
             if cp_timestamp:
-                ret_str += f"{crd.timestamp}\t"
-            for col, val in enumerate(row):
-                ret_str += f"{val[0]}\t{val[1]}" if get_unc else f"{val[0]}"
-                if col < len(row) - 1:
-                    ret_str += "\t"
-            ret_str += "\n"
-        QtWidgets.QApplication.clipboard().setText(ret_str)
+                fields.append(crd.timestamp)
+            lines.append(integrals_line(fields, row, get_unc))
+        QtWidgets.QApplication.clipboard().setText("".join(lines))
 
+    @QtCore.pyqtSlot()
+    def integrals_pkg_copy_to_clipboard_w_names(self):
+        """Copy package integrals with names to the clipboard."""
+        self.integrals_pkg_copy_to_clipboard(get_names=True)
+
+    @QtCore.pyqtSlot()
     def integrals_save_file(self, save_as: bool = False):
         """Save the integrals to a default file.
 
@@ -1535,6 +1633,12 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         # rimseval.data_io.integrals.export(crd, fname=fname)
         pass
 
+    @QtCore.pyqtSlot()
+    def integrals_save_file_as(self):
+        """Save integrals to a user specified file."""
+        self.integrals_save_file(save_as=True)
+
+    @QtCore.pyqtSlot()
     def backgrounds_draw(self):
         """Open GUI for user to draw backgrounds."""
         logy = self.config.get("Plot with log y-axis")
@@ -1548,6 +1652,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         if self.control_bg_correction.isChecked():
             self.status_widget.set_status("outdated")
 
+    @QtCore.pyqtSlot()
     def backgrounds_set_edit(self):
         """Open GUI for user to set / edit backgrounds by hand."""
         model = IntegralBackgroundDefinitionModel(self.current_crd_file.def_backgrounds)
@@ -1564,6 +1669,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
 
     # CALCULATE FUNCTIONS #
 
+    @QtCore.pyqtSlot()
     def calculate_single(self):
         """Applies the currently displayed settings to the displayed CRD file."""
         crd = self.current_crd_file
@@ -1617,17 +1723,29 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
 
         self.status_widget.set_status("current")
 
+    @QtCore.pyqtSlot()
     def calculate_batch(self):
         """Applies the currently configured settings to all open CRD files."""
+        if self.worker_busy:
+            return
+
         if not self.set_filters_from_controls():
             return
 
         main_id = self.file_names_model.currently_active
         opt_mcal = self.config.get("Optimize Mass Calibration")
         bg_corr = self.control_bg_correction.isChecked()
-        self.crd_files.apply_to_all(main_id, opt_mcal=opt_mcal, bg_corr=bg_corr)
+        self.start_worker(
+            self.crd_files.apply_to_all,
+            self.calculate_batch_finished,
+            main_id,
+            opt_mcal=opt_mcal,
+            bg_corr=bg_corr,
+            error_title="Error in batch calculation",
+        )
 
-        # update stuff
+    def calculate_batch_finished(self, _) -> None:
+        """Update the views once all files are calculated."""
         self.update_action_status()
         self.update_info_window(update_all=False)
         self.update_plot_window()
@@ -1637,11 +1755,15 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
 
     # LST FILE FUNCTIONS #
 
+    @QtCore.pyqtSlot()
     def convert_lst_to_crd(self, tagged=False):
         """Convert LST to CRD File(s).
 
         :param tagged: Split tagged data?
         """
+        if self.worker_busy:
+            return
+
         query = QtWidgets.QFileDialog.getOpenFileNames(
             self,
             "Open LST File(s)",
@@ -1656,28 +1778,65 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
                 tag = self.config.get("Tag Channel")
             else:
                 tag = None
-            for it, fname in enumerate(fnames):
-                try:
-                    lst = rimseval.data_io.lst_to_crd.LST2CRD(
-                        file_name=fname, channel_data=channel, channel_tag=tag
-                    )
-                    lst.read_list_file()
-                    lst.write_crd()
 
-                    self.status_bar.showMessage(
-                        f"{fname.name} converted, {it+1}/{len(fnames)} done.",
-                        msecs=self.status_bar_time,
-                    )
-                    QtWidgets.QApplication.processEvents()
+            # set user path to this folder
+            self.user_folder = fnames[-1].parent
+
+            self.start_worker(
+                self.convert_lst_files,
+                self.convert_lst_finished,
+                fnames,
+                channel,
+                tag,
+                error_title="LST File error",
+            )
 
-                except OSError as err:
-                    QtWidgets.QMessageBox.warning(self, "LST File error", err.args[0])
+    def convert_lst_files(
+        self, fnames: List[Path], channel: int, tag: Union[int, None]
+    ) -> List[str]:
+        """Convert LST files to CRD files, runs in a worker thread.
 
-            # set user path to this folder
-            self.user_folder = fname.parent
+        :param fnames: LST files to convert.
+        :param channel: Signal channel.
+        :param tag: Tag channel, None if tagged data should not be split.
+
+        :return: Error messages of files that could not be converted, one per file.
+        """
+        errors = []
+        for it, fname in enumerate(fnames):
+            if self.worker_cancel:
+                break
+            try:
+                lst = rimseval.data_io.lst_to_crd.LST2CRD(
+                    file_name=fname, channel_data=channel, channel_tag=tag
+                )
+                lst.read_list_file()
+                lst.write_crd()
+
+                self.signal_status_message.emit(
+                    f"{fname.name} converted, {it+1}/{len(fnames)} done."
+                )
+
+            except (OSError, ValueError, NotImplementedError) as err:
+                errors.append(f"{fname.name}: {err}")
+        return errors
+
+    def convert_lst_finished(self, errors: List[str]) -> None:
+        """Show the errors that occurred while converting LST files.
+
+        :param errors: Error messages of files that could not be converted.
+        """
+        if errors:
+            QtWidgets.QMessageBox.warning(self, "LST File error", "\n".join(errors))
+
+    @QtCore.pyqtSlot()
+    def convert_lst_to_crd_tagged(self):
+        """Convert tagged LST files to CRD files."""
+        self.convert_lst_to_crd(tagged=True)
 
     # EXPORT FUNCTIONS #
 
+    @QtCore.pyqtSlot()
     def export_spectrum_as_csv(self, tof: bool = False) -> None:
         """Export a spectrum to a csv file.
 
@@ -1702,6 +1861,12 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
                     self.current_crd_file, Path(fname), bins=bins
                 )
 
+    @QtCore.pyqtSlot()
+    def export_tof_spectrum_as_csv(self):
+        """Export the current ToF spectrum as a csv file."""
+        self.export_spectrum_as_csv(tof=True)
+
+    @QtCore.pyqtSlot()
     def export_all_open_spectra(self, tof: bool = False) -> None:
         """Export all open spectra to a csv file.
 
@@ -1767,8 +1932,19 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
             # now do the export
             export.export_histogram(fname, xdata, ydata, xtitle, names, dx)
 
+    @QtCore.pyqtSlot()
+    def export_all_mass_spectra(self):
+        """Export all open mass spectra as csv files."""
+        self.export_all_open_spectra(tof=False)
+
+    @QtCore.pyqtSlot()
+    def export_all_tof_spectra(self):
+        """Export all open ToF spectra as csv files."""
+        self.export_all_open_spectra(tof=True)
+
     # SPECIAL FUNCTIONS #
 
+    @QtCore.pyqtSlot()
     def clean_up_file(self) -> None:
         """Clean up the CRD file, especially calibration, and save it."""
         # Sort backgrounds
@@ -1783,6 +1959,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         self.save_calibration()
         self.status_widget.set_status("outdated")
 
+    @QtCore.pyqtSlot()
     def create_excel_workup(self) -> None:
         """Create an excel workup file."""
         query = QtWidgets.QFileDialog.getSaveFileName(
@@ -1798,6 +1975,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
                 self.current_crd_file, fname, timestamp=timestamp
             )
 
+    @QtCore.pyqtSlot()
     def histogram_ions_per_shot(self):
         """Plot a histogram of ions per shot."""
         theme = self.config.get("Theme")
@@ -1806,6 +1984,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         )
         self.tmp_window.show()
 
+    @QtCore.pyqtSlot()
     def histogram_dt_ions(self):
         """Plot a histogram of time delta between arriving ions.
 
@@ -1819,6 +1998,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         )
         self.tmp_window.show()
 
+    @QtCore.pyqtSlot()
     def plot_integrals_per_pkg(self):
         """Plot all integrals per pkg versus the package number."""
         theme = self.config.get("Theme")
@@ -1830,35 +2010,68 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
 
     # VIEW FUNCTIONS #
 
+    @QtCore.pyqtSlot()
     def window_elements(self):
         """Show / Hide information window."""
         if self.window_elements_action.isChecked():
+            if self.elements_window is None:
+                from elements import PeriodicTable
+
+                self.elements_window = PeriodicTable(self)
             self.elements_window.show()
-        else:
+        elif self.elements_window is not None:
             self.elements_window.close()
 
+    @QtCore.pyqtSlot()
     def window_info(self):
         """Show / Hide information window."""
         if self.window_info_action.isChecked():
+            if self.info_window is None:
+                from info_window import FileInfoWindow
+
+                self.info_window = FileInfoWindow(self)
+                if self.crd_files is not None:
+                    self.update_info_window(update_all=True)
             self.info_window.show()
-        else:
+        elif self.info_window is not None:
             self.info_window.close()
 
+    @QtCore.pyqtSlot()
     def window_plot(self):
         """Show / Hide plot window."""
         if self.window_plot_action.isChecked():
-            self.plot_window.show()
-        else:
+            if self.plot_window is None:
+                self.create_plot_window()
+                if self.crd_files is not None:
+                    self.update_plot_window()
+            self.show_plot_window()
+        elif self.plot_window is not None:
             self.plot_window.close()
 
+    def create_plot_window(self):
+        """Create the plot window, which is only done when it is first needed."""
+        from plot_window import PlotWindow
+
+        self.plot_window = PlotWindow(self)
+
+    def show_plot_window(self):
+        """Show the plot window and create it first if it does not exist yet."""
+        if self.plot_window is None:
+            self.create_plot_window()
+        self.plot_window.show()
+        self.window_plot_action.setChecked(True)
+
     # SETTINGS FUNCTIONS #
 
     def update_settings(self, update):
+        theme = self.config.get("Theme")
         self.config.set_many(update.as_dict())
         self.config.save()
 
-        self.setStyleSheet(qdarktheme.load_stylesheet(self.config.get("Theme")))
+        if self.config.get("Theme") != theme:
+            self.setStyleSheet(stylesheet(self.config.get("Theme")))
 
+    @QtCore.pyqtSlot()
     def normalizing_isotopes_dialog(self):
         """Bring up dialog to set / edit normalizing isotopes with ini."""
         model = NormIsosModel(ini.norm_isos)
@@ -1871,6 +2084,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
             self.config.save()
             self.status_widget.set_status("outdated")
 
+    @QtCore.pyqtSlot()
     def window_settings(self):
         """Settings Dialog."""
         config_dialog = ConfigDialog(self.config, self, cols=1)
@@ -1880,6 +2094,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         )
         config_dialog.exec()
 
+    @QtCore.pyqtSlot()
     def check_for_updates(self, startup=False):
         """Check for updates and open a dialog with the results."""
         curr_version = fbsrt_public_settings["version"]
@@ -1893,14 +2108,18 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         if startup and status != 0:
             return  # don't open anything, since it's at startup
 
-        dialog = CheckForUpdatesDialog(
-            self,
-            curr_version=curr_version,
-            latest_version=latest_version,
-            status=status,
-        )
-        dialog.exec()
+        if self._update_dialog is None:
+            self._update_dialog = CheckForUpdatesDialog(
+                self,
+                curr_version=curr_version,
+                latest_version=latest_version,
+                status=status,
+            )
+        else:
+            self._update_dialog.update_state(curr_version, latest_version, status)
+        self._update_dialog.exec()
 
+    @QtCore.pyqtSlot()
     def about_dialog(self):
         """Open an about dialog."""
         dialog = AboutDialog(self)
@@ -1908,8 +2127,12 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
 
     # ACTIONS ON CHANGED MODEL VIEWS #
 
+    @QtCore.pyqtSlot(QtCore.QModelIndex)
     def current_file_changed(self, ind: QtCore.QModelIndex) -> None:
         """Reacts to a different file that is currently selected."""
+        if self.worker_busy:
+            return
+
         self.file_names_model.update_current(ind.row())
         self.integrals_model.clear_data()
 
@@ -1925,6 +2148,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
             self.update_integral_view()
             self.update_plot_window()
 
+    @QtCore.pyqtSlot()
     def load_macro(self):
         """Queries the user for a macro and sets it to the load macro state."""
         query = QtWidgets.QFileDialog.getOpenFileName(
@@ -1941,6 +2165,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
 
         self.status_widget.set_status("outdated")
 
+    @QtCore.pyqtSlot()
     def unload_macro(self):
         """Unloads the user macro."""
         self.user_macro = None
@@ -2091,6 +2316,7 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
 
         return True  # all worked :)
 
+    @QtCore.pyqtSlot()
     def update_all(self):
         """Update Actions, Info, and Plot."""
         self.update_info_window()
@@ -2140,7 +2366,21 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         for action in all_actions:
             action.setDisabled(True)
 
-        if crd is None:
+        # opening and converting files is only possible when no worker is running
+        worker_actions = [
+            self.open_crd_action,
+            self.open_additional_crd_action,
+            self.lst_convert_action,
+            self.lst_convert_tagged_action,
+        ]
+        for action in worker_actions:
+            action.setDisabled(self.worker_busy)
+        # the active file and its settings must not change while a worker runs
+        self.file_names_view.setDisabled(self.worker_busy)
+        for widget in self.control_widgets:
+            widget.setDisabled(self.worker_busy)
+
+        if crd is None or self.worker_busy:
             return
 
         crd_loaded_actions = [
@@ -2222,6 +2462,9 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
 
         :param update_all: If True, header information is updated as well.
         """
+        if self.info_window is None:  # nothing to update before first shown
+            return
+
         crd_file = self.current_crd_file
         self.info_window.update_current(crd_file)
         if update_all:
@@ -2236,21 +2479,110 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
                 self.current_crd_file.integrals_delta,
             )
 
+    @QtCore.pyqtSlot()
     def update_plot_window(self) -> None:
         """Update the plot window."""
+        if self.plot_window is None:  # plotted with current data when first shown
+            return
+
         self.plot_window.update_data(self.current_crd_file)
 
+    @QtCore.pyqtSlot()
+    def plot_active_spectrum(self) -> None:
+        """Show the plot window with the spectrum of the active file."""
+        self.show_plot_window()
+        self.update_plot_window()
+
+    @QtCore.pyqtSlot()
     def update_plot_window_multi(self):
         """Takes the currently active crd spectra and sends them to the plot window."""
         if not self.crd_files:
             return
 
-        selected_models = self.file_names_view.selectedIndexes()
+        selected_models = self.file_names_view.selectionModel().selectedRows()
         selected_indexes = [it.row() for it in selected_models]
 
         crds_to_plot = [self.crd_files.files[it] for it in selected_indexes]
+        self.show_plot_window()
         self.plot_window.update_data(crds_to_plot)
 
+    # WORKER THREAD #
+
+    def start_worker(
+        self,
+        func: Callable,
+        continuation: Callable,
+        *args,
+        error_title: str = "Error",
+        **kwargs,
+    ) -> None:
+        """Run a function in a worker thread and continue when it is done.
+
+        Actions that would interfere with the worker are disabled while it runs.
+
+        :param func: Function to run in the worker thread.
+        :param continuation: Called in the GUI thread with the return value of
+            the function once it is done.
+        :param args: Positional arguments for the function.
+        :param error_title: Title of the warning shown if the function fails.
+        :param kwargs: Keyword arguments for the function.
+        """
+        self.worker_busy = True
+        self.worker_continuation = continuation
+        self.worker_error_title = error_title
+        self.worker_cancel = False
+        self.update_action_status()
+
+        self.worker_thread = QtCore.QThread()
+        self.worker = utils.ThreadWorker(func, *args, **kwargs)
+        self.worker.moveToThread(self.worker_thread)
+        self.worker_thread.started.connect(self.worker.run)
+        self.worker.finished.connect(self.worker_finished)
+        self.worker.failed.connect(self.worker_failed)
+        self.worker_thread.start()
+
+    def stop_worker(self) -> None:
+        """Wait for the worker thread to end and enable the actions again."""
+        self.worker_thread.quit()
+        self.worker_thread.wait()
+        self.worker_thread = None
+        self.worker = None
+        self.worker_busy = False
+        self.update_action_status()
+
+    @QtCore.pyqtSlot(object)
+    def worker_finished(self, result: Any) -> None:
+        """Stop the worker and continue with its result.
+
+        :param result: Return value of the function that ran in the worker.
+        """
+        if self.worker_thread is None:  # window was closed while the worker ran
+            return
+        continuation = self.worker_continuation
+        self.stop_worker()
+        continuation(result)
+
+    @QtCore.pyqtSlot(object)
+    def worker_failed(self, err: Exception) -> None:
+        """Stop the worker and show the error that occurred.
+
+        :param err: Exception raised in the worker.
+        """
+        if self.worker_thread is None:  # window was closed while the worker ran
+            return
+        self.stop_worker()
+        QtWidgets.QMessageBox.warning(self, self.worker_error_title, str(err))
+        self.status_widget.set_status("error")
+
+    @QtCore.pyqtSlot(str)
+    def show_status_message(self, msg) -> None:
+        """Show a message in the status bar.
+
+        :param msg: Message to show.
+        """
+        self.status_bar.showMessage(msg, msecs=self.status_bar_time)
+
+    @QtCore.pyqtSlot(str)
     def update_status_bar_processed(self, name) -> None:
         """Print message to status bar that a given file has been processed.
 
@@ -2262,9 +2594,57 @@ class MainRimsEvalGui(QtWidgets.QMainWindow):
         QtWidgets.QApplication.processEvents()
 
 
+@lru_cache(maxsize=4)
+def stylesheet(theme: str) -> str:
+    """Load the qdarktheme stylesheet for the given theme.
+
+    :param theme: Name of the theme, "dark" or "light".
+
+    :return: Stylesheet.
+    """
+    return qdarktheme.load_stylesheet(theme)
+
+
+def integrals_header_line(names: List[str], get_unc: bool, cp_timestamp: bool) -> str:
+    """Create the tab separated header line to copy integrals to the clipboard.
+
+    :param names: Names of the peaks.
+    :param get_unc: Add an uncertainty column for every peak?
+    :param cp_timestamp: Add a column for the timestamp?
+
+    :return: Header line, including the final newline.
+    """
+    fields = ["File Name", "Num of Shots"]
+    if cp_timestamp:
+        fields.append("Time")
+    if get_unc:
+        fields += [f"{name}\t{name}_1sig" for name in names]
+    else:
+        fields += [f"{name}" for name in names]
+    return "\t".join(fields) + "\n"
+
+
+def integrals_line(fields: List[Any], integrals: np.ndarray, get_unc: bool) -> str:
+    """Create one tab separated line of integrals to copy to the clipboard.
+
+    :param fields: Leading entries of the line, e.g., file name and number of shots.
+    :param integrals: Integrals with uncertainties, one row per peak.
+    :param get_unc: Add the uncertainty after every integral?
+
+    :return: Line with all entries, including the final newline.
+    """
+    fields = [f"{field}" for field in fields]
+    if get_unc:
+        fields += [f"{val[0]}\t{val[1]}" for val in integrals]
+    else:
+        fields += [f"{val[0]}" for val in integrals]
+    return "\t".join(fields) + "\n"
+
+
 if __name__ == "__main__":
     if ApplicationContext is not None:
         appctxt = ApplicationContext()  # 1. Instantiate ApplicationContext
+        utils.release_caches_on_quit(appctxt.app)
         window = MainRimsEvalGui(appctxt, is_windows=fbsrt_platform.is_windows())
         window.show()
         exit_code = appctxt.app.exec()  # 2. Invoke appctxt.app.exec()
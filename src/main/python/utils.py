@@ -1,9 +1,77 @@
 """Utility functions for the GUI."""
 
-from typing import Tuple
+from typing import Callable, Tuple
 
+from PyQt6 import QtCore
 import requests
 
+# cached functions that return Qt objects, cleared before the application quits
+_QT_OBJECT_CACHES = []
+
+
+class ThreadWorker(QtCore.QObject):
+    """Worker that runs a function in a separate thread.
+
+    Either ``finished`` with the return value of the function or ``failed`` with the
+    exception that occurred is emitted when the function is done.
+    """
+
+    finished = QtCore.pyqtSignal(object)
+    failed = QtCore.pyqtSignal(object)
+
+    def __init__(self, func: Callable, *args, **kwargs):
+        """Initialize the worker.
+
+        :param func: Function to run.
+        :param args: Positional arguments for the function.
+        :param kwargs: Keyword arguments for the function.
+        """
+        super().__init__()
+
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    @QtCore.pyqtSlot()
+    def run(self):
+        """Run the function and emit its result or the error that occurred."""
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except Exception as err:
+            self.failed.emit(err)
+        else:
+            self.finished.emit(result)
+
+
+def release_on_quit(func: Callable) -> Callable:
+    """Register a cached function that returns Qt objects to be cleared on quit.
+
+    Qt objects must not outlive the application, see ``release_caches_on_quit``.
+
+    :param func: Function decorated with ``lru_cache``.
+
+    :return: The same function.
+    """
+    _QT_OBJECT_CACHES.append(func)
+    return func
+
+
+def clear_qt_object_caches() -> None:
+    """Clear all registered caches of Qt objects."""
+    for func in _QT_OBJECT_CACHES:
+        func.cache_clear()
+
+
+def release_caches_on_quit(app: QtCore.QCoreApplication) -> None:
+    """Clear the registered caches of Qt objects when the application quits.
+
+    Call this once at application startup. Caches registered afterwards, e.g., from
+    modules that are imported lazily, are cleared as well.
+
+    :param app: The running application.
+    """
+    app.aboutToQuit.connect(clear_qt_object_caches)
+
 
 def check_update_status(curr_version) -> Tuple[str, int]:
     """Check online for the latest version and return version code and status.